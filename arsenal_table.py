@@ -0,0 +1,83 @@
+import numpy as np
+import polars as pl
+
+from compact_dtypes import widen_series
+from frame_cache import cached_for_frame
+
+PITCH_TYPES = {
+    'ff': 'Four-Seam', 'si': 'Sinker', 'fc': 'Cutter',
+    'sl': 'Slider', 'ch': 'Changeup', 'cu': 'Curveball',
+    'st': 'Sweeper', 'fs': 'Splitter', 'kn': 'Knuckleball',
+    'sv': 'Slurve'
+}
+
+# Savant's MLBAM id column, whichever name this leaderboard version uses
+PITCHER_ID_COLUMNS = ('pitcher', 'player_id')
+
+def build_arsenal_long(all_arsenals):
+    """Unpivot the arsenals leaderboard into one row per (pitcher_row, pitch_type).
+
+    Columns: pitcher_row (offset in the arsenals frame), pitcher_id (when the
+    leaderboard has one), pitch_order, pitch_type, pitch_name, avg_speed and
+    usage_rate (normalized). Rows are sorted by pitcher_row, so one pitcher's
+    arsenal is a contiguous slice.
+
+    Matches get_pitcher_arsenal_with_usage exactly: a pitch is kept when it has
+    a speed and positive usage, and usage is normalized so each pitcher sums
+    to 1.0 (totals accumulate in PITCH_TYPES order, as the per-pitcher loop does).
+    """
+    n = len(all_arsenals)
+    id_column = next((c for c in PITCHER_ID_COLUMNS if c in all_arsenals.columns), None)
+    totals = np.zeros(n)
+    parts = []
+    for order, (abbr, full_name) in enumerate(PITCH_TYPES.items()):
+        speed_col = f'{abbr}_avg_speed'
+        usage_col = f'{abbr}_usage_rate'
+        if speed_col not in all_arsenals.columns or usage_col not in all_arsenals.columns:
+            continue
+        # Compacted (Float32) columns are widened so usage and speed match the Float64 load exactly
+        usage = widen_series(all_arsenals[usage_col]).cast(pl.Float64).fill_null(0.0)
+        included = all_arsenals[speed_col].is_not_null() & (usage > 0)
+        totals += np.where(included.to_numpy(), usage.to_numpy(), 0.0)
+        parts.append(pl.DataFrame({
+            'pitcher_row': pl.int_range(n, eager=True, dtype=pl.UInt32),
+            'pitch_order': pl.repeat(order, n, eager=True, dtype=pl.UInt8),
+            'pitch_type': pl.repeat(abbr.upper(), n, eager=True),
+            'pitch_name': pl.repeat(full_name, n, eager=True),
+            'avg_speed': widen_series(all_arsenals[speed_col]),
+            'usage': usage,
+        }).filter(included))
+
+    if not parts:
+        return pl.DataFrame(schema={'pitcher_row': pl.UInt32, 'pitch_order': pl.UInt8,
+                                    'pitch_type': pl.String, 'pitch_name': pl.String,
+                                    'avg_speed': pl.Float64, 'usage_rate': pl.Float64})
+
+    long = pl.concat(parts, how='vertical_relaxed').sort(['pitcher_row', 'pitch_order'])
+    pitcher_rows = long['pitcher_row'].to_numpy()
+    usage_rate = (long['usage'].to_numpy() / 100.0) * (100.0 / totals[pitcher_rows])
+    long = long.drop('usage').with_columns(pl.Series('usage_rate', usage_rate))
+    if id_column:
+        long = long.with_columns(all_arsenals[id_column].gather(long['pitcher_row']).alias('pitcher_id'))
+        long = long.select(['pitcher_row', 'pitcher_id', *[c for c in long.columns
+                                                            if c not in ('pitcher_row', 'pitcher_id')]])
+    return long
+
+def get_arsenal_long(all_arsenals):
+    """Long arsenal table for a loaded arsenals frame, built once per frame"""
+    return cached_for_frame(all_arsenals, 'arsenal_long', build_arsenal_long)
+
+
+def pitcher_arsenal_slice(all_arsenals, pitcher_row):
+    """One pitcher's rows of the long arsenal table (a zero-copy slice, found by binary search)"""
+    long = get_arsenal_long(all_arsenals)
+    pitcher_rows = long['pitcher_row'].to_numpy()
+    start = int(np.searchsorted(pitcher_rows, pitcher_row, side='left'))
+    end = int(np.searchsorted(pitcher_rows, pitcher_row, side='right'))
+    return long.slice(start, end - start)
+
+def prepare_arsenals(all_arsenals):
+    """Build the long arsenal table right after a season load so scoring never pays for it"""
+    if all_arsenals is not None:
+        get_arsenal_long(all_arsenals)
+    return all_arsenals
@@ -0,0 +1,161 @@
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+# The scraper modules live in the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import polars as pl
+
+from scraper import (
+    calculate_matchup_score, calculate_weighted_metrics, get_batter_vs_pitches,
+    get_pitcher_arsenal_with_usage, parse_batter_name,
+)
+from synthetic import savant_name, synthetic_leaderboards, synthetic_slate
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results.jsonl')
+
+def git_commit():
+    """(short hash, dirty flag) of the repo, or (None, None) outside git"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, timeout=5).stdout.strip())
+        return commit or None, dirty
+    except Exception:
+        return None, None
+
+def build_cases(data, slate):
+    """One zero-argument callable per benchmark, each cycling through realistic inputs"""
+    arsenals, batter_stats = data['arsenals'], data['batter_stats']
+    lineup_strings = [s for game in slate for s in game['away_lineup'] + game['home_lineup']]
+    batter_names = [parse_batter_name(s) for s in lineup_strings]
+    pitcher_names = [savant_name(p) for p in data['pitchers'][:60]]
+
+    # Warm the per-frame name indexes and arsenal table so steady-state lookups are measured
+    pitcher_arsenals = [get_pitcher_arsenal_with_usage(name, arsenals) for name in pitcher_names]
+    pitcher_arsenals = [arsenal for arsenal in pitcher_arsenals if arsenal]
+    lookups = []
+    pairs = []
+    for i, batter in enumerate(batter_names):
+        arsenal = pitcher_arsenals[i % len(pitcher_arsenals)]
+        lookups.append((batter, list(arsenal.keys())))
+        stats = get_batter_vs_pitches(batter, list(arsenal.keys()), batter_stats)
+        if stats:
+            pairs.append((stats, arsenal))
+    metrics = [calculate_weighted_metrics(stats, arsenal) for stats, arsenal in pairs]
+
+    def cycle(items):
+        state = {'i': 0}
+        def next_item():
+            state['i'] = (state['i'] + 1) % len(items)
+            return items[state['i']]
+        return next_item
+
+    next_lineup = cycle(lineup_strings)
+    next_batter = cycle(lookups)
+    next_pitcher = cycle(pitcher_names)
+    next_pair = cycle(pairs)
+    next_metrics = cycle(metrics)
+    return {
+        'parse_batter_name': lambda: parse_batter_name(next_lineup()),
+        'get_batter_vs_pitches': lambda: get_batter_vs_pitches(*next_batter(), batter_stats),
+        'get_pitcher_arsenal_with_usage': lambda: get_pitcher_arsenal_with_usage(next_pitcher(), arsenals),
+        'calculate_weighted_metrics': lambda: calculate_weighted_metrics(*next_pair()),
+        'calculate_matchup_score': lambda: calculate_matchup_score(next_metrics()),
+    }
+
+def time_case(func, repeat, min_seconds):
+    """Per-call seconds for each of `repeat` rounds, each round long enough to be measurable"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    # autorange targets 0.2s; scale up to the requested round length
+    number = max(1, int(number * min_seconds / 0.2))
+    return [seconds / number for seconds in timer.repeat(repeat=repeat, number=number)], number
+
+def load_results(path=None):
+    """Every recorded run, oldest first"""
+    path = path or RESULTS_PATH
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def previous_run(runs, commit):
+    """Latest recorded run from a different commit, to compare against"""
+    for run in reversed(runs):
+        if run.get('commit') != commit:
+            return run
+    return runs[-1] if runs else None
+
+def print_results(run, baseline=None):
+    """Per-function table, with the change against a baseline run when there is one"""
+    print(f"\nScoring micro-benchmarks @ {run['commit']}{' (dirty)' if run['dirty'] else ''} "
+          f"- {run['sizes']['arsenal_rows']} pitchers, {run['sizes']['batter_stat_rows']} batter rows")
+    if baseline:
+        print(f"   compared with {baseline['commit']} from {baseline['timestamp']}")
+    for name, result in run['results'].items():
+        line = f"   {name:<32} best {result['best_us']:>9.2f}us  median {result['median_us']:>9.2f}us"
+        before = (baseline or {}).get('results', {}).get(name)
+        if before:
+            change = (result['best_us'] - before['best_us']) / before['best_us'] * 100
+            line += f"  ({change:+.1f}%)"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the scraper's scoring functions on synthetic leaderboards")
+    parser.add_argument('--pitchers', type=int, default=700)
+    parser.add_argument('--batters', type=int, default=900)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--repeat', type=int, default=7, help="Timing rounds per function")
+    parser.add_argument('--round-seconds', type=float, default=0.2, help="Minimum length of each round")
+    parser.add_argument('--only', action='append', help="Benchmark only these functions")
+    parser.add_argument('--results', default=RESULTS_PATH, help="JSON-lines file the run is appended to")
+    parser.add_argument('--no-save', action='store_true', help="Don't append this run to the results file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    data = synthetic_leaderboards(args.pitchers, args.batters, seed=args.seed)
+    slate = synthetic_slate(data, n_games=15, seed=args.seed)
+    cases = build_cases(data, slate)
+    print(f"Generated synthetic leaderboards in {time.perf_counter() - started:.1f}s")
+
+    results = {}
+    for name, func in cases.items():
+        if args.only and name not in args.only:
+            continue
+        per_call, number = time_case(func, args.repeat, args.round_seconds)
+        results[name] = {
+            'best_us': min(per_call) * 1e6,
+            'median_us': statistics.median(per_call) * 1e6,
+            'calls_per_round': number,
+            'rounds': args.repeat,
+        }
+
+    commit, dirty = git_commit()
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'polars': pl.__version__,
+        'machine': f"{platform.system()} {platform.machine()} {platform.node()}",
+        'seed': args.seed,
+        'sizes': {'arsenal_rows': len(data['arsenals']), 'batter_stat_rows': len(data['batter_stats'])},
+        'results': results,
+    }
+    runs = load_results(args.results)
+    print_results(run, previous_run(runs, commit))
+    if not args.no_save:
+        with open(args.results, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        print(f"\nAppended to {args.results}")
@@ -0,0 +1,184 @@
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import contextlib
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# The scraper modules live in the repo root
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'season_results.jsonl')
+
+class StandInWebhook:
+    """Local webhook receiver that counts requests and bytes, decoding gzip/zstd bodies"""
+
+    def __init__(self):
+        self.requests = 0
+        self.wire_bytes = 0
+        self.json_bytes = 0
+        self.lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                encoding = self.headers.get('Content-Encoding')
+                if encoding == 'gzip':
+                    decoded = gzip.decompress(body)
+                elif encoding == 'zstd':
+                    import zstandard
+                    decoded = zstandard.ZstdDecompressor().decompress(body)
+                else:
+                    decoded = body
+                with receiver.lock:
+                    receiver.requests += 1
+                    receiver.wire_bytes += len(body)
+                    receiver.json_bytes += len(decoded)
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def replay_season(days, games_per_day, seed, quiet=True):
+    """Run every synthetic day's slate through run_pipeline; returns the measurements"""
+    # Imported here, after main() has pointed the webhook settings at the stand-in
+    import outbox
+    import scraper
+    from metrics import percentile
+    from synthetic import synthetic_leaderboards, synthetic_slate
+
+    data = synthetic_leaderboards(seed=seed)
+    frames = (data['arsenals'], data['batter_stats'], data['batting_baselines'], data['pitching_baselines'])
+    # Slates are generated and encoded up front, so only the pipeline is timed
+    api_payloads = [json.dumps(synthetic_slate(data, n_games=games_per_day, seed=seed * 1000 + day))
+                    for day in range(days)]
+    rss_before = peak_rss_mb()
+
+    if scraper.USE_OUTBOX:
+        outbox.start_worker()
+    day_seconds = []
+    games = batters = lineup_batters = 0
+    sink = open(os.devnull, 'w') if quiet else None
+    started = time.perf_counter()
+    for payload in api_payloads:
+        day_start = time.perf_counter()
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            # Parse the API response as fetch_matchups does
+            api_data = json.loads(payload)
+            summary = scraper.run_pipeline(api_data, *frames)
+        day_seconds.append(time.perf_counter() - day_start)
+        games += summary['games_processed']
+        batters += summary['total_found']
+        lineup_batters += sum(len(m['away_lineup']) + len(m['home_lineup']) for m in api_data)
+        os.remove(summary['output_filename'])
+    # Queued deliveries are part of the pipeline, so the clock runs until the outbox drains
+    if scraper.USE_OUTBOX:
+        with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+            outbox.stop_worker(wait_seconds=600)
+    elapsed = time.perf_counter() - started
+    if sink:
+        sink.close()
+
+    return {
+        'days': days,
+        'games': games,
+        'lineup_batters': lineup_batters,
+        'batters_scored': batters,
+        'seconds': elapsed,
+        'games_per_sec': games / elapsed,
+        'batters_per_sec': batters / elapsed,
+        'day_p50_ms': percentile(day_seconds, 50) * 1000,
+        'day_p95_ms': percentile(day_seconds, 95) * 1000,
+        'day_max_ms': max(day_seconds) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+        'rss_before_replay_mb': rss_before,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a synthetic season through the full pipeline")
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--games', type=int, default=15, help="Games per day")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--compression', choices=['none', 'gzip', 'zstd'], default='none')
+    parser.add_argument('--chunking', choices=['none', 'game', 'size'], default='none')
+    parser.add_argument('--direct', action='store_true', help="Post directly instead of through the outbox")
+    parser.add_argument('--verbose', action='store_true', help="Show the pipeline's own output")
+    parser.add_argument('--results', default=RESULTS_PATH, help="JSON-lines file the run is appended to")
+    parser.add_argument('--no-save', action='store_true', help="Don't append this run to the results file")
+    args = parser.parse_args()
+    # The replay runs in a scratch dir that is gone by the time results are saved
+    args.results = os.path.abspath(args.results)
+
+    with StandInWebhook() as webhook, tempfile.TemporaryDirectory(prefix='season-replay-') as work_dir:
+        # The scraper reads these at import time; output files and the outbox go to a scratch dir
+        os.environ.update({
+            'WEBHOOK_URL': webhook.url,
+            'WEBHOOK_OUTBOX': '0' if args.direct else '1',
+            'WEBHOOK_OUTBOX_PATH': os.path.join(work_dir, 'outbox.sqlite3'),
+            'WEBHOOK_OUTBOX_POLL_INTERVAL': '0.05',
+            'WEBHOOK_COMPRESSION': args.compression,
+            'WEBHOOK_CHUNKING': args.chunking,
+            'METRICS_DIR': '',
+        })
+        os.chdir(work_dir)
+        print(f"Replaying {args.days} days x {args.games} games into {webhook.url} "
+              f"({'direct' if args.direct else 'outbox'}, compression {args.compression}, "
+              f"chunking {args.chunking})...")
+        measured = replay_season(args.days, args.games, args.seed, quiet=not args.verbose)
+        measured.update(webhook_requests=webhook.requests, payload_wire_bytes=webhook.wire_bytes,
+                        payload_json_bytes=webhook.json_bytes)
+
+    from bench_scoring import git_commit
+    commit, dirty = git_commit()
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()} {platform.node()}",
+        'settings': {'seed': args.seed, 'compression': args.compression, 'chunking': args.chunking,
+                     'delivery': 'direct' if args.direct else 'outbox'},
+        'results': measured,
+    }
+
+    m = measured
+    print(f"\nSeason replay @ {commit}{' (dirty)' if dirty else ''}")
+    print(f"   {m['games']} games, {m['batters_scored']}/{m['lineup_batters']} batters scored "
+          f"in {m['seconds']:.1f}s")
+    print(f"   {m['games_per_sec']:.1f} games/sec, {m['batters_per_sec']:.0f} batters/sec")
+    print(f"   per day: p50 {m['day_p50_ms']:.0f}ms, p95 {m['day_p95_ms']:.0f}ms, max {m['day_max_ms']:.0f}ms")
+    print(f"   peak RSS {m['peak_rss_mb']:.0f} MB ({m['rss_before_replay_mb']:.0f} MB before the replay)")
+    print(f"   webhook: {m['webhook_requests']} requests, {m['payload_json_bytes'] / 1e6:.1f} MB JSON, "
+          f"{m['payload_wire_bytes'] / 1e6:.1f} MB on the wire")
+    if not args.no_save:
+        with open(args.results, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        print(f"\nAppended to {args.results}")
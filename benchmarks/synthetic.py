@@ -0,0 +1,133 @@
+import random
+
+import polars as pl
+
+from arsenal_table import PITCH_TYPES
+
+# Enough overlap in last names to exercise the name-index fallbacks, plus accents and suffixes
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Rodríguez', 'García', 'Martínez', 'Hernández', 'Pérez', 'Díaz', 'Judge',
+    'Soto', 'Betts', 'Freeman', 'Ohtani', 'Acuña', 'Guerrero', 'Tatis', 'Witt', 'Skubal', 'Cole',
+    'Burnes', 'Wheeler', 'Alcántara', 'Valdez', 'Ramírez', 'Torres', 'Castillo', 'Ortiz', 'Cruz',
+    'Reyes', 'Morales', 'Gómez', 'Suárez', 'Lee', 'Kim', 'Brown', 'Miller', 'Davis', 'Wilson',
+]
+FIRST_NAMES = [
+    'Aaron', 'Juan', 'Mookie', 'Freddie', 'Shohei', 'Ronald', 'Vladimir', 'Fernando', 'Bobby',
+    'Tarik', 'Gerrit', 'Corbin', 'Zack', 'Sandy', 'Framber', 'José', 'Luis', 'Carlos', 'Mike',
+    'Michael', 'Will', 'William', 'Matt', 'Matthew', 'Chris', 'Christopher', 'Julio', 'Yordan',
+]
+SUFFIXES = ['Jr.', 'II', 'III']
+POSITIONS = ['C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF', 'DH']
+
+def synthetic_players(n, rnd):
+    """n distinct (first, last) pairs; some last names carry a suffix, as in Savant's data"""
+    players = set()
+    while len(players) < n:
+        last = rnd.choice(LAST_NAMES)
+        # Compound surnames keep most names distinct while plenty still share a last name
+        if rnd.random() < 0.6:
+            last = f"{last}-{rnd.choice(LAST_NAMES)}"
+        if rnd.random() < 0.04:
+            last = f"{last} {rnd.choice(SUFFIXES)}"
+        players.add((rnd.choice(FIRST_NAMES), last))
+    return sorted(players, key=lambda p: (p[1], p[0]))
+
+def savant_name(player):
+    """'Last, First' as Savant's leaderboards spell it"""
+    first, last = player
+    return f"{last}, {first}"
+
+def synthetic_arsenals(pitchers, rnd):
+    """Arsenal leaderboard: one row per pitcher with <type>_avg_speed / <type>_usage_rate columns"""
+    base_speed = {'ff': 94, 'si': 93, 'fc': 89, 'sl': 85, 'ch': 85, 'cu': 79, 'st': 82, 'fs': 86, 'kn': 76, 'sv': 81}
+    rows = []
+    for i, player in enumerate(pitchers):
+        row = {'last_name, first_name': savant_name(player), 'pitcher': 500000 + i}
+        repertoire = rnd.sample(list(PITCH_TYPES), rnd.randint(2, 6))
+        weights = [rnd.uniform(0.2, 1.0) for _ in repertoire]
+        total = sum(weights)
+        for pitch_type in PITCH_TYPES:
+            if pitch_type in repertoire:
+                row[f'{pitch_type}_avg_speed'] = round(base_speed[pitch_type] + rnd.gauss(0, 2), 1)
+                row[f'{pitch_type}_usage_rate'] = round(weights[repertoire.index(pitch_type)] / total * 100, 1)
+            else:
+                row[f'{pitch_type}_avg_speed'] = None
+                row[f'{pitch_type}_usage_rate'] = None
+        rows.append(row)
+    return pl.DataFrame(rows)
+
+def synthetic_batter_stats(batters, rnd):
+    """Pitch-arsenal-stats leaderboard: one row per (batter, pitch type faced)"""
+    rows = []
+    for i, player in enumerate(batters):
+        for pitch_type in PITCH_TYPES:
+            if rnd.random() > 0.65:
+                continue
+            pa = rnd.randint(1, 180)
+            rows.append({
+                'last_name, first_name': savant_name(player),
+                'player_id': 600000 + i,
+                'pitch_type': pitch_type.upper(),
+                'pitch_name': PITCH_TYPES[pitch_type],
+                'pa': pa,
+                # Small samples sometimes have no batted-ball metrics at all
+                'ba': round(min(max(rnd.gauss(0.245, 0.07), 0), 1), 3) if pa > 3 else None,
+                'est_ba': round(min(max(rnd.gauss(0.245, 0.05), 0), 1), 3) if pa > 3 else None,
+                'slg': round(min(max(rnd.gauss(0.410, 0.12), 0), 4), 3),
+                'hard_hit_percent': round(min(max(rnd.gauss(38, 10), 0), 100), 1),
+                'whiff_percent': round(min(max(rnd.gauss(24, 9), 0), 100), 1),
+                'k_percent': round(min(max(rnd.gauss(22, 8), 0), 100), 1) if pa > 3 else None,
+            })
+    return pl.DataFrame(rows)
+
+def synthetic_baselines(players, batting):
+    """FanGraphs-style season lines with 'First Last' names"""
+    names = [f"{first} {last}" for first, last in players]
+    if batting:
+        return pl.DataFrame({'Name': names, 'AVG': [0.248] * len(names), 'K%': [0.225] * len(names),
+                             'OPS': [0.735] * len(names), 'PA': [450] * len(names)})
+    return pl.DataFrame({'Name': names, 'K%': [0.235] * len(names), 'ERA': [4.1] * len(names),
+                         'WHIP': [1.27] * len(names), 'IP': [120.0] * len(names)})
+
+def synthetic_leaderboards(n_pitchers=700, n_batters=900, seed=7):
+    """Arsenals, batter stats and FanGraphs baselines, plus the player lists behind them"""
+    rnd = random.Random(seed)
+    pitchers = synthetic_players(n_pitchers, rnd)
+    batters = synthetic_players(n_batters, rnd)
+    return {
+        'arsenals': synthetic_arsenals(pitchers, rnd),
+        # Savant returns rows grouped by pitch type, not by batter
+        'batter_stats': synthetic_batter_stats(batters, rnd).sample(fraction=1.0, shuffle=True, seed=seed),
+        'batting_baselines': synthetic_baselines(batters, batting=True),
+        'pitching_baselines': synthetic_baselines(pitchers, batting=False),
+        'pitchers': pitchers,
+        'batters': batters,
+    }
+
+def lineup_string(player, rnd, slot):
+    """A lineup entry as the matchup API formats it, e.g. '3 Juan Soto (L) RF'"""
+    first, last = player
+    return f"{slot} {first} {last} ({rnd.choice('LRS')}) {rnd.choice(POSITIONS)}"
+
+def pitcher_string(player, rnd):
+    """A probable pitcher as the matchup API formats it, e.g. '(L) Tarik Skubal'"""
+    first, last = player
+    return f"({rnd.choice('LR')}) {first} {last}"
+
+def synthetic_slate(data, n_games=15, seed=11, unknown_rate=0.05):
+    """Matchup API payload; a few batters and pitchers are missing from the leaderboards"""
+    rnd = random.Random(seed)
+    unknown = lambda: (rnd.choice(FIRST_NAMES), f"Rookie{rnd.randint(1, 99999)}")
+    games = []
+    for game in range(n_games):
+        def pick(players):
+            return unknown() if rnd.random() < unknown_rate else rnd.choice(players)
+        games.append({
+            'away_team': f"AWY{game}",
+            'home_team': f"HOM{game}",
+            'away_pitcher': pitcher_string(pick(data['pitchers']), rnd),
+            'home_pitcher': pitcher_string(pick(data['pitchers']), rnd),
+            'away_lineup': [lineup_string(pick(data['batters']), rnd, slot) for slot in range(1, 10)],
+            'home_lineup': [lineup_string(pick(data['batters']), rnd, slot) for slot in range(1, 10)],
+        })
+    return games
@@ -0,0 +1,70 @@
+import polars as pl
+
+def pitch_type_enum(values):
+    """Enum over the pitch types present in `values`"""
+    return pl.Enum(sorted(values.drop_nulls().unique().to_list()))
+
+def float32_is_lossless(series):
+    """True when every value survives a trip through Float32 and back (e.g. .263, 23.4, 95.3)"""
+    return bool(widen_series(series.cast(pl.Float32)).eq_missing(series).all())
+
+def widen_series(series):
+    """Float32 -> Float64 via the shortest decimal form, so 0.263 comes back as 0.263, not 0.2630000114"""
+    if series.dtype != pl.Float32:
+        return series
+    return series.cast(pl.String).cast(pl.Float64)
+
+def widen_floats(df):
+    """Widen a frame's Float32 columns back to Float64 before values leave Polars (no-op without any)"""
+    float32_columns = [name for name, dtype in df.schema.items() if dtype == pl.Float32]
+    if not float32_columns:
+        return df
+    return df.with_columns(widen_series(df[name]) for name in float32_columns)
+
+def row_dict(df, offset):
+    """One row as a dict, with Float32 values widened"""
+    return widen_floats(df.slice(offset, 1)).row(0, named=True)
+
+def compact_frame(df):
+    """Cast a leaderboard to compact dtypes without changing any value it hands out.
+
+    Strings become Categorical (pitch_type becomes an Enum), integers shrink to
+    the smallest type that holds them, and Float64 columns become Float32 only
+    where every value round-trips exactly; the rest stay Float64.
+    """
+    if df is None:
+        return None
+    casts = []
+    for name, dtype in df.schema.items():
+        column = df[name]
+        if name == 'pitch_type' and dtype == pl.String:
+            casts.append(column.cast(pitch_type_enum(column)))
+        elif dtype == pl.String:
+            casts.append(column.cast(pl.Categorical))
+        elif dtype.is_integer():
+            casts.append(column.shrink_dtype())
+        elif dtype == pl.Float64 and float32_is_lossless(column):
+            casts.append(column.cast(pl.Float32))
+    return df.with_columns(casts) if casts else df
+
+def compact_with_report(df, label, report):
+    """compact_frame, appending (label, bytes before, bytes after) to `report`"""
+    if df is None:
+        return None
+    before = df.estimated_size()
+    compacted = compact_frame(df)
+    report.append((label, before, compacted.estimated_size()))
+    return compacted
+
+def print_memory_report(report):
+    """Print per-frame memory before and after compaction"""
+    if not report:
+        return
+    width = max(len(label) for label, _, _ in report)
+    print("\n🗜️  Compact dtypes:")
+    for label, before, after in report:
+        print(f"   {label:<{width}} {before / 1e6:>8.2f} MB -> {after / 1e6:>8.2f} MB "
+              f"({(1 - after / before) * 100 if before else 0:.0f}% smaller)")
+    total_before = sum(before for _, before, _ in report)
+    total_after = sum(after for _, _, after in report)
+    print(f"   {'total':<{width}} {total_before / 1e6:>8.2f} MB -> {total_after / 1e6:>8.2f} MB")
@@ -0,0 +1,255 @@
+import os
+import threading
+
+import polars as pl
+
+import metrics
+from arsenal_table import PITCHER_ID_COLUMNS
+from frame_cache import cached_for_frame
+from leaderboard_cache import write_cache
+from name_index import lookup_rows, split_name
+
+# Persisted between runs, so ids linked once (e.g. from last season) keep resolving
+CROSSWALK_PATH = os.getenv('CROSSWALK_PATH', os.path.join('.cache', 'crosswalk.parquet'))
+
+SAVANT_NAME_COLUMN = 'last_name, first_name'
+FANGRAPHS_NAME_COLUMN = 'Name'
+# FanGraphs' own id and its MLBAM id, under the names the leaderboard versions use
+FANGRAPHS_ID_COLUMNS = ('playerid', 'IDfg')
+FANGRAPHS_MLBAM_COLUMNS = ('xMLBAMID', 'mlbamid')
+
+SCHEMA = {'role': pl.String, 'name_key': pl.String, 'name': pl.String,
+          'mlbam_id': pl.Int64, 'fangraphs_id': pl.Int64}
+
+# The crosswalk player resolution uses (None until a load builds one), numbered so
+# indexes built against an earlier crosswalk are never reused
+_active = {'crosswalk': None, 'generation': 0}
+_lock = threading.Lock()
+
+def first_column(df, candidates):
+    """First of `candidates` present in the frame, or None"""
+    return next((column for column in candidates if column in df.columns), None)
+
+def name_key(name):
+    """'last|first' as the name index normalizes it"""
+    return '|'.join(split_name(name))
+
+def savant_rows(df, role):
+    """(role, name_key, name, mlbam_id) for every distinct player in a Savant frame"""
+    id_column = first_column(df, PITCHER_ID_COLUMNS) if df is not None else None
+    if id_column is None or SAVANT_NAME_COLUMN not in df.columns:
+        return None
+    players = df.select(pl.col(SAVANT_NAME_COLUMN).cast(pl.String).alias('name'),
+                        pl.col(id_column).cast(pl.Int64).alias('mlbam_id')).unique(maintain_order=True)
+    return players.with_columns(
+        pl.lit(role).alias('role'),
+        pl.col('name').map_elements(name_key, return_dtype=pl.String).alias('name_key'),
+        pl.lit(None, dtype=pl.Int64).alias('fangraphs_id'),
+    ).select(list(SCHEMA))
+
+def fangraphs_rows(df, role):
+    """(role, name_key, name, mlbam_id, fangraphs_id) for a FanGraphs frame; mlbam_id is null when it has no MLBAM column"""
+    if df is None or FANGRAPHS_NAME_COLUMN not in df.columns:
+        return None
+    fangraphs_id = first_column(df, FANGRAPHS_ID_COLUMNS)
+    mlbam_id = first_column(df, FANGRAPHS_MLBAM_COLUMNS)
+    players = df.select(
+        pl.col(FANGRAPHS_NAME_COLUMN).cast(pl.String).alias('name'),
+        (pl.col(mlbam_id) if mlbam_id else pl.lit(None)).cast(pl.Int64).alias('mlbam_id'),
+        (pl.col(fangraphs_id) if fangraphs_id else pl.lit(None)).cast(pl.Int64).alias('fangraphs_id'),
+    ).unique(maintain_order=True)
+    return players.with_columns(
+        pl.lit(role).alias('role'),
+        pl.col('name').map_elements(name_key, return_dtype=pl.String).alias('name_key'),
+    ).select(list(SCHEMA))
+
+def unique_ids(reference, key):
+    """(key, linked_id) for `key` values that belong to exactly one MLBAM id in `reference`"""
+    return (reference.drop_nulls([key, 'mlbam_id']).group_by(key)
+            .agg(pl.col('mlbam_id').unique().alias('ids'))
+            .filter(pl.col('ids').list.len() == 1)
+            .select(key, pl.col('ids').list.first().alias('linked_id')))
+
+def link_by(rows, reference, key):
+    """Fill missing MLBAM ids in `rows` from `key` values (name_key or fangraphs_id) unambiguous in `reference`"""
+    return (rows.join(unique_ids(reference, key), on=key, how='left', maintain_order='left')
+            .with_columns(pl.coalesce('mlbam_id', 'linked_id').alias('mlbam_id'))
+            .select(list(SCHEMA)))
+
+def build_crosswalk(sources, previous=None):
+    """One row per (role, normalized name, MLBAM id, FanGraphs id) seen.
+
+    `sources` is (role, savant_df, fangraphs_df) triples - batter stats with
+    batting, arsenals with pitching. Savant frames supply MLBAM ids
+    directly. FanGraphs rows use their MLBAM column when the leaderboard has
+    one; otherwise they are linked only within their own role: by FanGraphs
+    id to a saved row, then by a name that is unambiguous among the paired
+    Savant frame's players, then among the saved rows. So the catcher Will
+    Smith is never linked to the pitcher, even on a day Savant lists only
+    the pitcher. Rows from `previous` (the persisted crosswalk) are kept, so
+    a player absent today still resolves.
+    """
+    parts = [previous] if previous is not None else []
+    for role, savant_df, fangraphs_df in sources:
+        savant_players = savant_rows(savant_df, role)
+        saved = previous.filter(pl.col('role') == role) if previous is not None else None
+        if savant_players is not None:
+            parts.append(savant_players)
+        rows = fangraphs_rows(fangraphs_df, role)
+        if rows is None:
+            continue
+        if saved is not None:
+            rows = link_by(rows, saved, 'fangraphs_id')
+        for reference in (savant_players, saved):
+            if reference is not None:
+                rows = link_by(rows, reference, 'name_key')
+        parts.append(rows)
+    if not parts:
+        return pl.DataFrame(schema=SCHEMA)
+
+    player = ['role', 'name_key', 'mlbam_id']
+    crosswalk = (pl.concat(parts, how='vertical_relaxed').drop_nulls('mlbam_id')
+                 .unique(player + ['fangraphs_id'], keep='first', maintain_order=True))
+    # Every (MLBAM id, FanGraphs id) pair is kept; a row without a FanGraphs id only while the player has none
+    has_fangraphs_id = pl.col('fangraphs_id').is_not_null().any().over(player)
+    return crosswalk.filter(pl.col('fangraphs_id').is_not_null() | ~has_fangraphs_id).select(list(SCHEMA))
+
+def load_crosswalk(path=None):
+    """The persisted crosswalk, or None if there isn't one yet"""
+    path = path or CROSSWALK_PATH
+    if not os.path.exists(path):
+        return None
+    try:
+        crosswalk = pl.read_parquet(path)
+        if 'role' not in crosswalk.columns:
+            # Written before links were kept per role, so it may hold cross-role links - start over
+            print(f"   Crosswalk {path} predates player roles - rebuilding it")
+            return None
+        return crosswalk.select(list(SCHEMA)).cast(SCHEMA)
+    except Exception as e:
+        print(f"   Warning: Could not read crosswalk {path}: {e}")
+        return None
+
+def refresh_crosswalk(sources, path=None):
+    """Rebuild the crosswalk from freshly loaded frames plus the persisted one, save it and make it active"""
+    path = path or CROSSWALK_PATH
+    with metrics.span('crosswalk_build'):
+        crosswalk = build_crosswalk(sources, previous=load_crosswalk(path))
+    try:
+        write_cache(crosswalk, path)
+    except Exception as e:
+        print(f"   Warning: Could not save crosswalk {path}: {e}")
+    activate_crosswalk(crosswalk)
+    linked = crosswalk.drop_nulls('fangraphs_id')['mlbam_id'].n_unique()
+    print(f"🔗 Crosswalk: {crosswalk['mlbam_id'].n_unique()} players, {len(crosswalk)} entries, "
+          f"{linked} with FanGraphs ids")
+    return crosswalk
+
+def activate_crosswalk(crosswalk):
+    """Resolve players through this crosswalk from now on (None goes back to per-frame name lookups)"""
+    with _lock:
+        _active['crosswalk'] = crosswalk
+        _active['generation'] += 1
+
+def active_crosswalk():
+    """The crosswalk in use, or None"""
+    return _active['crosswalk']
+
+def current():
+    """(crosswalk, generation), read together"""
+    with _lock:
+        return _active['crosswalk'], _active['generation']
+
+def build_name_ids(crosswalk):
+    """Map name_key -> MLBAM ids with that exact normalized name, in crosswalk order"""
+    name_ids = {}
+    for key, mlbam_id in crosswalk.select('name_key', 'mlbam_id').iter_rows():
+        ids = name_ids.setdefault(key, [])
+        if mlbam_id not in ids:
+            ids.append(mlbam_id)
+    return name_ids
+
+def get_name_ids(crosswalk):
+    """The crosswalk's name_key -> MLBAM ids map, built once per crosswalk"""
+    return cached_for_frame(crosswalk, 'name_ids', build_name_ids)
+
+def candidate_ids(crosswalk, name):
+    """MLBAM ids whose normalized name is exactly `name` (two players can share one); no surname guessing"""
+    return get_name_ids(crosswalk).get(name_key(name), [])
+
+def build_id_index(df, crosswalk):
+    """Map MLBAM id -> row offsets for a Savant or FanGraphs frame, or None if its rows can't be keyed"""
+    id_column = first_column(df, PITCHER_ID_COLUMNS + FANGRAPHS_MLBAM_COLUMNS)
+    fangraphs_column = first_column(df, FANGRAPHS_ID_COLUMNS)
+    if id_column:
+        ids = [[mlbam_id] for mlbam_id in df[id_column].cast(pl.Int64).to_list()]
+    elif fangraphs_column:
+        # FanGraphs ids are mapped to MLBAM ids through the crosswalk; unlinked rows get none
+        fangraphs_ids = {}
+        for fangraphs_id, mlbam_id in crosswalk.drop_nulls('fangraphs_id').select(
+                'fangraphs_id', 'mlbam_id').unique(maintain_order=True).iter_rows():
+            fangraphs_ids.setdefault(fangraphs_id, []).append(mlbam_id)
+        ids = [fangraphs_ids.get(fangraphs_id, []) for fangraphs_id in df[fangraphs_column].cast(pl.Int64).to_list()]
+    elif FANGRAPHS_NAME_COLUMN in df.columns:
+        # A leaderboard with no ids at all: each row stands for every player with its exact name
+        name_ids = get_name_ids(crosswalk)
+        ids = [name_ids.get(name_key(name or ''), []) for name in df[FANGRAPHS_NAME_COLUMN].cast(pl.String).to_list()]
+    else:
+        return None
+
+    index = {}
+    for offset, candidates in enumerate(ids):
+        for mlbam_id in candidates:
+            if mlbam_id is not None:
+                index.setdefault(mlbam_id, []).append(offset)
+    return index
+
+def get_id_index(df, crosswalk, generation):
+    """The MLBAM id index for a frame, built once per (frame, crosswalk)"""
+    return cached_for_frame(df, ('id_index', generation), lambda frame: build_id_index(frame, crosswalk))
+
+def player_rows(df, name_column, name):
+    """Row offsets in `df` for the player `name`.
+
+    With an active crosswalk, MLBAM ids whose normalized name matches `name`
+    exactly are probed in the frame's id index, taking the first with rows
+    here (the pitcher Will Smith in an arsenal frame, the catcher in batter
+    stats). Without a crosswalk, for a frame without usable ids, for a name
+    with no exact crosswalk match, or when no matching id has rows here,
+    this is the per-frame name lookup.
+    """
+    crosswalk, generation = current()
+    index = get_id_index(df, crosswalk, generation) if crosswalk is not None else None
+    if index is None:
+        return lookup_rows(df, name_column, name)
+    candidates = candidate_ids(crosswalk, name)
+    if not candidates:
+        metrics.incr('crosswalk_unknown_names')
+        return lookup_rows(df, name_column, name)
+    for mlbam_id in candidates:
+        offsets = index.get(mlbam_id)
+        if offsets:
+            return offsets
+    metrics.incr('crosswalk_misses')
+    return lookup_rows(df, name_column, name)
+
+def frame_ids(df):
+    """(row, mlbam_id) pairs for a Savant or FanGraphs frame, for id-keyed joins; None without a crosswalk"""
+    crosswalk, generation = current()
+    if crosswalk is None:
+        return None
+    index = get_id_index(df, crosswalk, generation)
+    if index is None:
+        return None
+    pairs = [(offset, mlbam_id) for mlbam_id, offsets in index.items() for offset in offsets]
+    return pl.DataFrame(pairs, schema={'row': pl.UInt32, 'mlbam_id': pl.Int64}, orient='row').sort('row')
+
+def warm_id_indexes(*frames):
+    """Build the crosswalk's name map and each frame's id index now, off the scoring path"""
+    crosswalk, generation = current()
+    if crosswalk is None:
+        return
+    get_name_ids(crosswalk)
+    for df in frames:
+        if df is not None:
+            get_id_index(df, crosswalk, generation)
@@ -0,0 +1,177 @@
+import os
+import time
+import signal
+import argparse
+import threading
+from datetime import datetime
+
+import frame_cache
+import http_client
+import metrics
+import outbox
+from crosswalk import active_crosswalk, warm_id_indexes
+from name_index import get_name_index
+from slate_engine import NAME_COLUMN
+from scraper import (
+    SEASON_YEAR, USE_OUTBOX, WEBHOOK_URL, fetch_matchups, load_all_sources,
+    print_summary, run_pipeline,
+)
+
+# Seconds between scheduled runs; 0 runs only when triggered with SIGUSR1
+DAEMON_RUN_INTERVAL = float(os.getenv('DAEMON_RUN_INTERVAL', '1800'))
+
+# Reload the leaderboards once they are this old (SIGHUP forces a reload)
+DAEMON_REFRESH_HOURS = float(os.getenv('DAEMON_REFRESH_HOURS', '6'))
+
+# Resident frames are held in compact dtypes unless turned off
+DAEMON_COMPACT_DTYPES = os.getenv('DAEMON_COMPACT_DTYPES', '1') not in ('0', 'false', 'no')
+
+class ResidentData:
+    """Savant and FanGraphs frames, plus their name indexes, kept loaded between runs"""
+
+    def __init__(self, refresh_hours=None, compact_dtypes=None):
+        self.refresh_hours = DAEMON_REFRESH_HOURS if refresh_hours is None else refresh_hours
+        self.compact_dtypes = DAEMON_COMPACT_DTYPES if compact_dtypes is None else compact_dtypes
+        self.frames = None
+        self.loaded_at = None
+        self.date = None
+
+    def is_stale(self):
+        if self.frames is None or datetime.now().strftime("%Y-%m-%d") != self.date:
+            return True
+        return time.time() - self.loaded_at > self.refresh_hours * 3600
+
+    def load(self, refresh=False):
+        """(Re)load every leaderboard; on failure the previous frames stay in use. Returns True if loaded"""
+        print(f"Loading {SEASON_YEAR} MLB data (Savant + FanGraphs)...")
+        started = time.perf_counter()
+        # Release indexes built for the old frames before the new ones arrive
+        frame_cache.clear()
+        sources = load_all_sources(refresh=refresh, include_matchups=False, compact_dtypes=self.compact_dtypes)
+        if sources['arsenals'] is None or sources['batter_stats'] is None:
+            print("Could not load Savant leaderboards" +
+                  (" - keeping the previous data" if self.frames else ""))
+            return False
+
+        batting_baselines, pitching_baselines = sources['baselines']
+        self.frames = (sources['arsenals'], sources['batter_stats'], batting_baselines, pitching_baselines)
+        warm_indexes(*self.frames)
+        self.loaded_at = time.time()
+        self.date = datetime.now().strftime("%Y-%m-%d")
+        print(f"Loaded {len(sources['arsenals'])} pitchers, {len(sources['batter_stats'])} batter records "
+              f"in {time.perf_counter() - started:.1f}s")
+        return True
+
+def warm_indexes(all_arsenals, all_batter_stats, batting_baselines, pitching_baselines):
+    """Build every player index now so the first triggered run doesn't pay for it"""
+    if active_crosswalk() is not None:
+        warm_id_indexes(all_arsenals, all_batter_stats, batting_baselines, pitching_baselines)
+        return
+    get_name_index(all_arsenals, NAME_COLUMN)
+    get_name_index(all_batter_stats, NAME_COLUMN)
+    for baselines in (batting_baselines, pitching_baselines):
+        if baselines is not None:
+            get_name_index(baselines, 'Name')
+
+def run_once(data, publish='full', compact=False):
+    """Fetch today's matchups and run the pipeline against the resident frames"""
+    started = time.perf_counter()
+    api_data = fetch_matchups()
+    if not api_data:
+        print("No matchups found")
+        return None
+    fetched = time.perf_counter()
+    summary = run_pipeline(api_data, *data.frames, publish=publish, compact=compact)
+    finished = time.perf_counter()
+    print(f"Run finished in {finished - started:.2f}s "
+          f"(matchups {fetched - started:.2f}s, scoring and publish {finished - fetched:.2f}s)")
+    return summary
+
+def serve(interval=None, publish='full', compact=False, refresh=False, compact_dtypes=None):
+    """Run on a timer and on SIGUSR1 until SIGTERM/SIGINT; SIGHUP reloads the leaderboards first"""
+    interval = DAEMON_RUN_INTERVAL if interval is None else interval
+    data = ResidentData(compact_dtypes=compact_dtypes)
+    if not data.load(refresh=refresh):
+        return
+
+    trigger = threading.Event()
+    state = {'stop': False, 'reload': False, 'run': False}
+
+    def on_trigger(signum, frame):
+        state['run'] = True
+        trigger.set()
+
+    def on_reload(signum, frame):
+        state['reload'] = True
+        trigger.set()
+
+    def on_stop(signum, frame):
+        state['stop'] = True
+        trigger.set()
+
+    signal.signal(signal.SIGUSR1, on_trigger)
+    signal.signal(signal.SIGHUP, on_reload)
+    signal.signal(signal.SIGTERM, on_stop)
+    signal.signal(signal.SIGINT, on_stop)
+
+    if WEBHOOK_URL and USE_OUTBOX:
+        outbox.start_worker()
+    print(f"Daemon ready (pid {os.getpid()}): "
+          f"{f'running every {interval:g}s' if interval else 'timer off'}, `kill -USR1 {os.getpid()}` to run now")
+
+    # The first run happens straight away
+    next_run = time.time()
+    try:
+        while True:
+            timeout = None if next_run is None else max(0.0, next_run - time.time())
+            trigger.wait(timeout)
+            trigger.clear()
+            if state['stop']:
+                break
+            if state['reload'] or data.is_stale():
+                data.load(refresh=state['reload'])
+                state['reload'] = False
+            # A SIGHUP reload on its own doesn't start a run
+            due = state['run'] or (next_run is not None and time.time() >= next_run)
+            state['run'] = False
+            if not due:
+                continue
+
+            print(f"\n{'='*60}\nDaemon run at {datetime.now()}")
+            try:
+                summary = run_once(data, publish=publish, compact=compact)
+                if summary:
+                    print_summary(summary)
+                    # Counters accumulate over the daemon's life, as Prometheus expects
+                    metrics.write_run_summary({
+                        'games_processed': summary['games_processed'],
+                        'batters_found': summary['total_found'],
+                        'output_filename': summary['output_filename'],
+                        'http': http_client.latency_stats(),
+                    })
+            except Exception as e:
+                print(f"Run failed: {e}")
+            next_run = time.time() + interval if interval else None
+    finally:
+        if WEBHOOK_URL and USE_OUTBOX:
+            remaining = outbox.stop_worker(30)
+            if remaining:
+                print(f"{remaining} payloads still queued - they are retried by `python outbox.py`")
+        http_client.print_latency_report()
+        print("Daemon stopped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep season data loaded and run the scraper on a timer or SIGUSR1")
+    parser.add_argument('--interval', type=float, default=DAEMON_RUN_INTERVAL,
+                        help="Seconds between scheduled runs (0: only when triggered)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Re-download leaderboards at startup")
+    parser.add_argument('--publish', choices=['full', 'delta'],
+                        default=os.getenv('PUBLISH_MODE', 'full'))
+    parser.add_argument('--compact', action='store_true',
+                        default=os.getenv('OUTPUT_COMPACT', '') in ('1', 'true', 'yes'))
+    parser.add_argument('--compact-dtypes', action=argparse.BooleanOptionalAction, default=DAEMON_COMPACT_DTYPES,
+                        help="Hold the resident leaderboards in compact dtypes (default on)")
+    args = parser.parse_args()
+    serve(args.interval, publish=args.publish, compact=args.compact, refresh=args.refresh,
+          compact_dtypes=args.compact_dtypes)
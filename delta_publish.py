@@ -0,0 +1,147 @@
+import os
+import json
+import hashlib
+
+from report_writer import dumps
+
+# Where the last published snapshot (fingerprints only) is kept between runs
+SNAPSHOT_PATH = os.getenv('PUBLISH_SNAPSHOT_PATH', 'last_published_snapshot.json')
+
+def fingerprint(obj):
+    """Stable short hash of a JSON-serializable object"""
+    data = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return hashlib.sha1(data).hexdigest()[:16]
+
+def game_numbers(api_data):
+    """1 for each team pairing's first game on the slate, 2 for a doubleheader's second, ..."""
+    seen = {}
+    numbers = []
+    for matchup in api_data:
+        teams = (matchup['away_team'], matchup['home_team'])
+        seen[teams] = seen.get(teams, 0) + 1
+        numbers.append(seen[teams])
+    return numbers
+
+def game_key(report):
+    """Identify a game across runs (a doubleheader's later games get a |<game_number> suffix)"""
+    key = f"{report['game_date']}|{report['matchup']}"
+    return key if report['game_number'] == 1 else f"{key}|{report['game_number']}"
+
+def matchup_key(matchup):
+    """Identify a batter within a game across runs"""
+    return f"{matchup['team']}|{matchup['batter']}"
+
+def load_snapshot(path=None):
+    """Last published snapshot, or an empty one"""
+    path = path or SNAPSHOT_PATH
+    if not os.path.exists(path):
+        return {'date': None, 'snapshot_id': None, 'games': {}}
+    with open(path) as f:
+        return json.load(f)
+
+def save_snapshot(snapshot, path=None):
+    """Persist the snapshot atomically"""
+    path = path or SNAPSHOT_PATH
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+class DeltaSink:
+    """Report-writer sink that diffs each game against the last published snapshot.
+
+    Only added or changed matchups (and a game's pitcher block when it
+    changed) are kept; everything else is reduced to fingerprints. A
+    snapshot from a previous date is ignored, so each day starts with a
+    full publish.
+    """
+
+    def __init__(self, header, snapshot, partial=False):
+        self.header = header
+        self.previous = snapshot['games'] if snapshot.get('date') == header['date'] else {}
+        self.base_snapshot_id = snapshot.get('snapshot_id') if self.previous else None
+        # A partial diff only sees some games; the rest are carried over unless remove_game() is called
+        self.partial = partial
+        self.removed_keys = []
+        self.games = {}
+        self.changed_games = []
+        self.counts = {'added': 0, 'changed': 0, 'unchanged': 0, 'removed': 0}
+
+    def __call__(self, report, report_bytes=None):
+        key = game_key(report)
+        before = self.previous.get(key, {'pitchers': None, 'matchups': {}})
+        pitchers_print = fingerprint(report['pitchers'])
+        matchup_prints = {}
+        upserts = []
+        for matchup in report['key_matchups']:
+            batter_key = matchup_key(matchup)
+            matchup_prints[batter_key] = fingerprint(matchup)
+            previous_print = before['matchups'].get(batter_key)
+            if previous_print is None:
+                self.counts['added'] += 1
+                upserts.append(matchup)
+            elif previous_print != matchup_prints[batter_key]:
+                self.counts['changed'] += 1
+                upserts.append(matchup)
+            else:
+                self.counts['unchanged'] += 1
+
+        removed = [batter_key for batter_key in before['matchups'] if batter_key not in matchup_prints]
+        self.counts['removed'] += len(removed)
+        self.games[key] = {'pitchers': pitchers_print, 'matchups': matchup_prints}
+
+        pitchers_changed = pitchers_print != before['pitchers']
+        if upserts or removed or pitchers_changed:
+            game_delta = {
+                'game_date': report['game_date'],
+                'matchup': report['matchup'],
+                'game_number': report['game_number'],
+                'batters_found': report['batters_found'],
+                'batters_missing': report['batters_missing'],
+                'upserts': upserts,
+                'tombstones': [batter_key.split('|', 1)[1] for batter_key in removed],
+            }
+            if pitchers_changed:
+                game_delta['pitchers'] = report['pitchers']
+            self.changed_games.append(game_delta)
+
+    def remove_game(self, key):
+        """Mark a game (by game_key) as gone from the slate"""
+        if key in self.previous and key not in self.removed_keys:
+            self.removed_keys.append(key)
+
+    def finish(self):
+        """Build the delta payload and the snapshot to save once it is published"""
+        # Games that disappeared entirely become game-level tombstones
+        if self.partial:
+            removed_games = list(self.removed_keys)
+            games = {key: game for key, game in self.previous.items() if key not in removed_games}
+            games.update(self.games)
+        else:
+            removed_games = [key for key in self.previous if key not in self.games]
+            games = self.games
+        for key in removed_games:
+            self.counts['removed'] += len(self.previous[key]['matchups'])
+
+        snapshot = {'date': self.header['date'], 'games': games}
+        snapshot['snapshot_id'] = fingerprint(snapshot['games'])
+        delta = dict(
+            self.header,
+            mode='delta',
+            base_snapshot_id=self.base_snapshot_id,
+            snapshot_id=snapshot['snapshot_id'],
+            changes=self.counts,
+            games=self.changed_games,
+            removed_games=[key.split('|', 1)[1] for key in removed_games],
+        )
+        return delta, snapshot
+
+    def has_changes(self):
+        """True if anything differs from the last published snapshot"""
+        if self.partial:
+            return bool(self.changed_games or self.removed_keys)
+        return bool(self.changed_games) or any(key not in self.games for key in self.previous)
+
+def serialize_delta(delta, compact=True):
+    """Delta payload as JSON bytes"""
+    return dumps(delta, compact=compact)
@@ -0,0 +1,35 @@
+import threading
+from collections import OrderedDict
+
+import metrics
+
+# Derived structures (name indexes, long arsenal tables) are cached per loaded frame
+MAX_CACHED_ENTRIES = 16
+_CACHE = OrderedDict()
+# Loader threads and the query service's request threads share the cache
+_LOCK = threading.Lock()
+
+def cached_for_frame(df, key, build):
+    """Return build(df), computed once per (frame, key) and reused while the frame is alive"""
+    cache_key = (id(df), key)
+    with _LOCK:
+        cached = _CACHE.get(cache_key)
+        # Holding the frame in the cache keeps id() from being reused by a different frame
+        if cached is not None and cached[0] is df:
+            _CACHE.move_to_end(cache_key)
+            metrics.incr('frame_cache_hits')
+            return cached[1]
+
+    # Built outside the lock; two threads racing on a cold key just build it twice
+    metrics.incr('frame_cache_misses')
+    value = build(df)
+    with _LOCK:
+        _CACHE[cache_key] = (df, value)
+        while len(_CACHE) > MAX_CACHED_ENTRIES:
+            _CACHE.popitem(last=False)
+    return value
+
+def clear():
+    """Drop every cached structure, releasing the frames they hold (e.g. before a reload)"""
+    with _LOCK:
+        _CACHE.clear()
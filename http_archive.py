@@ -0,0 +1,122 @@
+import os
+import glob
+import json
+import base64
+import hashlib
+import threading
+
+# 'record' captures every HTTP exchange to the archive, 'replay' serves them back offline
+ARCHIVE_MODE = os.getenv('HTTP_ARCHIVE_MODE', '')
+ARCHIVE_DIR = os.getenv('HTTP_ARCHIVE_DIR', 'http_archive')
+
+_state = {'mode': None, 'dir': None, 'original_send': None}
+_counters = {}
+_lock = threading.Lock()
+
+def archive_mode():
+    """Return (mode, archive_dir); mode is None, 'record' or 'replay'"""
+    return _state['mode'], _state['dir']
+
+def exchange_key(method, url):
+    """Archive key for a request. Bodies are left out so a webhook POST replays whatever the payload"""
+    return hashlib.sha1(f"{method.upper()} {url}".encode('utf-8')).hexdigest()[:20]
+
+def next_exchange_path(method, url):
+    """Path for the next exchange of this request; repeated calls are numbered in order"""
+    key = exchange_key(method, url)
+    with _lock:
+        n = _counters.get(key, 0)
+        _counters[key] = n + 1
+    return os.path.join(_state['dir'], 'http', f"{key}-{n:03d}.json")
+
+def record_exchange(request, response):
+    """Write one request/response pair to the archive"""
+    path = next_exchange_path(request.method, request.url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    body = request.body.encode('utf-8') if isinstance(request.body, str) else (request.body or b'')
+    entry = {
+        'method': request.method,
+        'url': request.url,
+        'request_sha1': hashlib.sha1(body).hexdigest() if isinstance(body, bytes) else None,
+        'status_code': response.status_code,
+        'reason': response.reason,
+        'headers': dict(response.headers),
+        'elapsed_ms': response.elapsed.total_seconds() * 1000,
+        'body_b64': base64.b64encode(response.content).decode('ascii'),
+    }
+    with open(path, 'w') as f:
+        json.dump(entry, f, indent=2)
+
+def replay_exchange(request):
+    """Build a Response for a request from the archive, without touching the network"""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    path = next_exchange_path(request.method, request.url)
+    if not os.path.exists(path):
+        # Past the last recorded call for this URL, keep serving the last one
+        key = exchange_key(request.method, request.url)
+        recorded = sorted(glob.glob(os.path.join(_state['dir'], 'http', f"{key}-*.json")))
+        if not recorded:
+            raise requests.exceptions.ConnectionError(
+                f"Replay: no recorded response for {request.method} {request.url}", request=request)
+        path = recorded[-1]
+
+    with open(path) as f:
+        entry = json.load(f)
+
+    response = requests.Response()
+    response.status_code = entry['status_code']
+    response.reason = entry['reason']
+    # Content is stored decoded, so drop the transport encoding headers
+    headers = {k: v for k, v in entry['headers'].items()
+               if k.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')}
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = base64.b64decode(entry['body_b64'])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    return response
+
+def enable(mode, archive_dir=None):
+    """Route every requests call through the archive in 'record' or 'replay' mode"""
+    import requests
+
+    if mode not in ('record', 'replay'):
+        raise ValueError(f"Unknown archive mode: {mode}")
+    archive_dir = archive_dir or ARCHIVE_DIR
+    if mode == 'replay' and not os.path.isdir(archive_dir):
+        raise FileNotFoundError(f"Replay archive not found: {archive_dir}")
+
+    _state['mode'] = mode
+    _state['dir'] = archive_dir
+    _counters.clear()
+    if _state['original_send'] is None:
+        _state['original_send'] = requests.sessions.Session.send
+
+    original_send = _state['original_send']
+
+    def archived_send(session, request, **kwargs):
+        if _state['mode'] == 'replay':
+            return replay_exchange(request)
+        response = original_send(session, request, **kwargs)
+        if _state['mode'] == 'record':
+            record_exchange(request, response)
+        return response
+
+    requests.sessions.Session.send = archived_send
+    print(f"HTTP archive: {mode} mode using {archive_dir}")
+
+def disable():
+    """Restore normal network access"""
+    if _state['original_send'] is not None:
+        import requests
+        requests.sessions.Session.send = _state['original_send']
+        _state['original_send'] = None
+    _state['mode'] = None
+    _state['dir'] = None
+
+def configure_from_env():
+    """Enable the archive if HTTP_ARCHIVE_MODE is set"""
+    if ARCHIVE_MODE:
+        enable(ARCHIVE_MODE, ARCHIVE_DIR)
@@ -0,0 +1,144 @@
+import os
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import percentile
+
+# Connect/read timeouts (seconds) for every call unless overridden
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '45'))
+
+# Retries with exponential backoff and full jitter, capped per sleep and per call
+MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '4'))
+BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', '1.0'))
+BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', '15'))
+MAX_ELAPSED = float(os.getenv('HTTP_MAX_ELAPSED', '120'))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+POOL_SIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+_stats = {}
+_stats_lock = threading.Lock()
+
+def get_session():
+    """Shared keep-alive session; connections are pooled per host"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Retries are handled in request() so they can back off with jitter and be counted
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2^attempt)]"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+def record_call(endpoint, seconds, outcome):
+    """Track latency and outcome per endpoint ('ok', 'retry', 'error' or 'http_<status>' for a 4xx/5xx)"""
+    with _stats_lock:
+        stats = _stats.setdefault(endpoint, {'latencies': [], 'errors': 0, 'retries': 0, 'statuses': {}})
+        stats['latencies'].append(seconds)
+        if outcome.startswith('http_'):
+            stats['errors'] += 1
+            stats['statuses'][outcome] = stats['statuses'].get(outcome, 0) + 1
+        elif outcome == 'error':
+            stats['errors'] += 1
+        elif outcome == 'retry':
+            stats['retries'] += 1
+
+def request(method, url, endpoint=None, timeout=None, retries=None, max_elapsed=None, **kwargs):
+    """Make an HTTP call on the pooled session, retrying connection errors, timeouts and 5xx/429.
+
+    Returns the final Response (callers still call raise_for_status) or
+    raises the last connection error once retries or max_elapsed run out.
+    A read timeout means the server may already have the request, so a POST
+    only retries it when it carries an Idempotency-Key.
+    """
+    endpoint = endpoint or url
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    retries = MAX_RETRIES if retries is None else retries
+    max_elapsed = MAX_ELAPSED if max_elapsed is None else max_elapsed
+    session = get_session()
+    started = time.perf_counter()
+    headers = {name.lower() for name in (kwargs.get('headers') or {})}
+    replay_safe = method.upper() != 'POST' or 'idempotency-key' in headers
+
+    attempt = 0
+    while True:
+        call_start = time.perf_counter()
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            response = None
+            error = e
+        elapsed = time.perf_counter() - call_start
+
+        if response is None:
+            # ConnectTimeout is also a ConnectionError: the request never reached the server
+            retryable = replay_safe or isinstance(error, requests.exceptions.ConnectionError)
+        else:
+            retryable = response.status_code in RETRY_STATUSES
+        delay = backoff_delay(attempt)
+        out_of_time = time.perf_counter() - started + delay > max_elapsed
+        if not retryable or attempt >= retries or out_of_time:
+            if response is None:
+                outcome = 'error'
+            elif response.status_code >= 400:
+                outcome = f"http_{response.status_code}"
+            else:
+                outcome = 'ok'
+            record_call(endpoint, elapsed, outcome)
+            if response is None:
+                raise error
+            return response
+
+        record_call(endpoint, elapsed, 'retry')
+        reason = f"status {response.status_code}" if response is not None else type(error).__name__
+        print(f"   {endpoint}: {reason}, retrying in {delay:.1f}s (attempt {attempt + 1}/{retries})")
+        time.sleep(delay)
+        attempt += 1
+
+def get(url, **kwargs):
+    """GET through the pooled, retrying client"""
+    return request('GET', url, **kwargs)
+
+def post(url, **kwargs):
+    """POST through the pooled, retrying client"""
+    return request('POST', url, **kwargs)
+
+def latency_stats():
+    """Per-endpoint call counts, errors, retries and latency percentiles (seconds)"""
+    with _stats_lock:
+        return {
+            endpoint: {
+                'calls': len(stats['latencies']),
+                'errors': stats['errors'],
+                'retries': stats['retries'],
+                'statuses': dict(stats['statuses']),
+                'p50': percentile(stats['latencies'], 50),
+                'p95': percentile(stats['latencies'], 95),
+                'max': max(stats['latencies']) if stats['latencies'] else 0.0,
+            }
+            for endpoint, stats in _stats.items()
+        }
+
+def print_latency_report():
+    """Print the per-endpoint latency table"""
+    stats = latency_stats()
+    if not stats:
+        return
+    print("\n🌐 HTTP latency by endpoint:")
+    for endpoint, s in stats.items():
+        statuses = ''.join(f"  {status} x{count}" for status, count in sorted(s['statuses'].items()))
+        print(f"   {endpoint:<12} calls {s['calls']:>3}  retries {s['retries']:>2}  errors {s['errors']:>2}  "
+              f"p50 {s['p50']:.2f}s  p95 {s['p95']:.2f}s  max {s['max']:.2f}s{statuses}")
@@ -0,0 +1,61 @@
+import re
+import sys
+import subprocess
+
+# One line of `python -X importtime` output: self and cumulative microseconds, then the indented module name
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def parse_importtime(lines):
+    """Parse -X importtime lines into (module, self_us, cumulative_us, depth), skipping anything else"""
+    entries = []
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+def import_report(entries, top=15):
+    """Direct imports by cumulative time and packages by self time (milliseconds)"""
+    direct = sorted(((module, cumulative / 1000) for module, _, cumulative, depth in entries if depth == 0),
+                    key=lambda item: -item[1])
+    packages = {}
+    for module, self_us, _, _ in entries:
+        package = module.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us / 1000
+    return {
+        'total_ms': sum(ms for _, ms in direct),
+        'modules': len(entries),
+        'direct': direct[:top],
+        'packages': sorted(packages.items(), key=lambda item: -item[1])[:top],
+    }
+
+def print_import_report(report):
+    """Print the import-time tables"""
+    print(f"\n📦 Import time: {report['total_ms']:.0f}ms across {report['modules']} modules")
+    print("   Direct imports (cumulative, including lazy imports made during the run):")
+    for module, ms in report['direct']:
+        print(f"   {module:<32} {ms:>8.1f}ms")
+    print("   Packages (self time):")
+    for package, ms in report['packages']:
+        print(f"   {package:<32} {ms:>8.1f}ms")
+
+def run_with_import_profile(script, argv, top=15):
+    """Run a script under -X importtime, pass its output through, then print where import time went"""
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', script] + list(argv),
+                               stderr=subprocess.PIPE, text=True)
+    importtime_lines = []
+    for line in process.stderr:
+        if line.startswith('import time:'):
+            importtime_lines.append(line)
+        else:
+            sys.stderr.write(line)
+    returncode = process.wait()
+    print_import_report(import_report(parse_importtime(importtime_lines), top=top))
+    return returncode
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python import_profile.py SCRIPT [ARGS...]")
+        sys.exit(2)
+    sys.exit(run_with_import_profile(sys.argv[1], sys.argv[2:]))
@@ -0,0 +1,123 @@
+import os
+import re
+import time
+import hashlib
+from datetime import datetime
+
+import polars as pl
+
+import metrics
+from http_archive import archive_mode
+
+# Where cached leaderboards live - override on Render with a persistent disk path
+CACHE_DIR = os.getenv('LEADERBOARD_CACHE_DIR', os.path.join('.cache', 'leaderboards'))
+
+# How long a cached leaderboard stays fresh (hours)
+CACHE_TTL_HOURS = float(os.getenv('LEADERBOARD_CACHE_TTL_HOURS', '12'))
+
+# Set to 1 to ignore the cache and re-download everything
+FORCE_REFRESH = os.getenv('LEADERBOARD_CACHE_REFRESH', '') in ('1', 'true', 'yes')
+
+def cache_path(func_name, season, params, cache_dir=None):
+    """Build the Parquet path for a leaderboard call, keyed by function, season and params"""
+    cache_dir = cache_dir or CACHE_DIR
+    if params:
+        key = '_'.join(f"{k}={params[k]}" for k in sorted(params))
+        key = re.sub(r'[^A-Za-z0-9_=.-]', '-', key)
+        # Keep filenames short if someone passes a lot of params
+        if len(key) > 80:
+            key = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    else:
+        key = 'default'
+    return os.path.join(cache_dir, func_name, str(season), f"{key}.parquet")
+
+def is_fresh(path, ttl_hours=None):
+    """A cache file is fresh if it is younger than the TTL and was written today (same data day)"""
+    if not os.path.exists(path):
+        return False
+    ttl_hours = CACHE_TTL_HOURS if ttl_hours is None else ttl_hours
+    modified = os.path.getmtime(path)
+    if time.time() - modified > ttl_hours * 3600:
+        return False
+    return datetime.fromtimestamp(modified).date() == datetime.now().date()
+
+def write_cache(df, path):
+    """Write a frame to the cache atomically so a crashed run never leaves half a file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.write_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+def prune(frame, columns=None, predicate=None):
+    """Apply a row predicate and a column projection to a LazyFrame.
+
+    Columns missing from this leaderboard version are skipped rather than
+    failing the load. On a Parquet scan both are pushed down into the reader.
+    """
+    if predicate is not None:
+        frame = frame.filter(predicate)
+    if columns is not None:
+        available = set(frame.collect_schema().names())
+        frame = frame.select([column for column in columns if column in available])
+    return frame
+
+def load_cached_leaderboard(func, season, refresh=None, ttl_hours=None, cache_dir=None,
+                            columns=None, predicate=None, **params):
+    """Call a leaderboard function through the Parquet cache.
+
+    Fresh cache entries are read from disk; otherwise the leaderboard is
+    downloaded and cached. If the download fails and a stale copy exists,
+    the stale copy is used rather than failing the run.
+
+    The cache always holds the full leaderboard; `columns` and `predicate`
+    only shape the frame returned to the caller.
+    """
+    func_name = getattr(func, '__name__', str(func))
+    with metrics.span(f"leaderboard:{func_name}"):
+        return _load_cached_leaderboard(func, func_name, season, refresh, ttl_hours, cache_dir,
+                                        columns, predicate, params)
+
+def _load_cached_leaderboard(func, func_name, season, refresh, ttl_hours, cache_dir, columns, predicate, params):
+    refresh = FORCE_REFRESH if refresh is None else refresh
+    def scan(source):
+        return prune(pl.scan_parquet(source), columns, predicate).collect()
+
+    path = cache_path(func_name, season, params, cache_dir)
+
+    # In record/replay mode the archive keeps its own copy of every leaderboard
+    mode, archive_dir = archive_mode()
+    archive_path = cache_path(func_name, season, params, os.path.join(archive_dir, 'leaderboards')) \
+        if mode else None
+    if mode == 'replay':
+        if not os.path.exists(archive_path):
+            raise FileNotFoundError(f"Replay: no recorded {func_name}({season}) at {archive_path}")
+        return scan(archive_path)
+
+    if not refresh and is_fresh(path, ttl_hours):
+        start = time.perf_counter()
+        if mode == 'record':
+            # The archive gets the full leaderboard, like the cache
+            write_cache(pl.read_parquet(path), archive_path)
+        df = scan(path)
+        print(f"   Cache hit: {func_name}({season}) from {path} in {(time.perf_counter() - start)*1000:.0f}ms "
+              f"({df.width} columns, {len(df)} rows)")
+        metrics.incr('leaderboard_cache_hits')
+        return df
+
+    metrics.incr('leaderboard_cache_misses')
+    try:
+        df = func(season, **params)
+    except Exception as e:
+        if os.path.exists(path):
+            print(f"   Warning: {func_name}({season}) failed ({e}), using stale cache {path}")
+            metrics.incr('leaderboard_stale_fallbacks')
+            return scan(path)
+        raise
+
+    try:
+        write_cache(df, path)
+    except Exception as e:
+        print(f"   Warning: Could not cache {func_name}({season}): {e}")
+    if mode == 'record':
+        write_cache(df, archive_path)
+    return prune(df.lazy(), columns, predicate).collect()
@@ -0,0 +1,73 @@
+import queue
+import time
+import threading
+
+def load_concurrently(sources):
+    """Run independent loaders in parallel with a per-source timeout.
+
+    `sources` maps a name to (loader, timeout_seconds, default). Each loader is
+    called with no arguments on its own daemon thread. A loader that raises or
+    exceeds its timeout yields its default instead of failing the whole stage,
+    and a hung loader never holds up the caller or interpreter exit.
+
+    Returns (results, timings) where timings maps name -> dict with
+    seconds and status ('ok', 'error' or 'timeout').
+    """
+    results = {}
+    timings = {}
+    finished = queue.Queue()
+    stage_start = time.perf_counter()
+
+    def run(name, loader):
+        start = time.perf_counter()
+        try:
+            finished.put((name, 'ok', loader(), time.perf_counter() - start))
+        except Exception as e:
+            finished.put((name, 'error', e, time.perf_counter() - start))
+
+    for name, (loader, _, _) in sources.items():
+        threading.Thread(target=run, args=(name, loader), name=f"load-{name}", daemon=True).start()
+
+    # Timeouts count from stage start, so a slow source never delays another's deadline
+    deadlines = {name: stage_start + timeout for name, (_, timeout, _) in sources.items()}
+    while deadlines:
+        remaining = max(0.0, min(deadlines.values()) - time.perf_counter())
+        try:
+            name, status, value, seconds = finished.get(timeout=remaining)
+        except queue.Empty:
+            now = time.perf_counter()
+            for name in [name for name, deadline in deadlines.items() if deadline <= now]:
+                _, timeout, default = sources[name]
+                print(f"   Warning: {name} timed out after {timeout:g}s")
+                timings[name] = {'seconds': now - stage_start, 'status': 'timeout'}
+                results[name] = default
+                del deadlines[name]
+            continue
+        if name not in deadlines:
+            # Already given up on; the late result is dropped
+            continue
+        del deadlines[name]
+        if status == 'ok':
+            results[name] = value
+        else:
+            print(f"   Warning: {name} failed: {value}")
+            results[name] = sources[name][2]
+        timings[name] = {'seconds': seconds, 'status': status}
+
+    # Report in the order the sources were given, not the order they finished
+    results = {name: results[name] for name in sources}
+    timings = {name: timings[name] for name in sources}
+    timings['_total'] = {'seconds': time.perf_counter() - stage_start, 'status': 'ok'}
+    return results, timings
+
+def print_timing_report(timings):
+    """Print how long each source took and how the total compares to running them serially"""
+    print("\n⏱️  Source load times:")
+    serial = 0.0
+    for name, timing in timings.items():
+        if name == '_total':
+            continue
+        serial += timing['seconds']
+        print(f"   {name:<20} {timing['seconds']:7.2f}s  {timing['status']}")
+    total = timings.get('_total', {}).get('seconds', 0.0)
+    print(f"   {'total (concurrent)':<20} {total:7.2f}s  (serial would be ~{serial:.2f}s)")
@@ -0,0 +1,175 @@
+import argparse
+import time
+
+import numpy as np
+import polars as pl
+
+from arsenal_table import PITCH_TYPES, get_arsenal_long
+from compact_dtypes import widen_series
+from name_index import build_name_index, lookup_offsets
+from slate_engine import NAME_COLUMN, matchup_scores
+
+PITCH_TYPE_CODES = [abbr.upper() for abbr in PITCH_TYPES]
+
+# Metric columns folded into the weighted averages, and the output name for each
+MATRIX_METRICS = {
+    'ba': 'weighted_ba',
+    'est_ba': 'weighted_est_ba',
+    'whiff_percent': 'weighted_whiff',
+    'k_percent': 'weighted_k_rate',
+    'hard_hit_percent': 'weighted_hard_hit',
+}
+
+# Batters need at least this many PA (across all pitch types) to be scored
+MIN_BATTER_PA = 25
+
+def build_usage_matrix(all_arsenals):
+    """Pitcher x pitch-type matrix of normalized usage, plus the pitcher name/id for each row"""
+    long = get_arsenal_long(all_arsenals)
+    pitcher_rows = long['pitcher_row'].unique().sort()
+    row_of = np.full(len(all_arsenals), -1, dtype=np.int64)
+    row_of[pitcher_rows.to_numpy()] = np.arange(len(pitcher_rows))
+
+    usage = np.zeros((len(pitcher_rows), len(PITCH_TYPE_CODES)))
+    type_index = long['pitch_order'].to_numpy().astype(np.int64)
+    usage[row_of[long['pitcher_row'].to_numpy()], type_index] = long['usage_rate'].to_numpy()
+
+    pitchers = all_arsenals[pitcher_rows].select(NAME_COLUMN).rename({NAME_COLUMN: 'pitcher'})
+    if 'pitcher_id' in long.columns:
+        ids = long.unique('pitcher_row', keep='first', maintain_order=True)['pitcher_id']
+        pitchers = pitchers.with_columns(ids.alias('pitcher_id'))
+    return usage, pitchers
+
+def build_batter_matrices(all_batter_stats, min_pa=MIN_BATTER_PA):
+    """Batter x pitch-type metric matrices, a row-count (coverage) matrix and a PA matrix.
+
+    Missing metrics count as 0, exactly as calculate_weighted_metrics treats them;
+    the count matrix records which (batter, pitch type) cells have data at all.
+    """
+    key_columns = [NAME_COLUMN] + (['player_id'] if 'player_id' in all_batter_stats.columns else [])
+    stats = (
+        all_batter_stats
+        .filter(pl.col('pitch_type').is_in(PITCH_TYPE_CODES))
+        .with_columns(pl.col('pa').fill_null(0).sum().over(key_columns).alias('_batter_pa'))
+        .filter(pl.col('_batter_pa') >= min_pa)
+    )
+    batters = stats.select(key_columns).unique(maintain_order=True)
+    stats = stats.join(batters.with_row_index('_batter'), on=key_columns, how='left')
+
+    batter_index = stats['_batter'].to_numpy().astype(np.int64)
+    type_index = stats['pitch_type'].cast(pl.String).replace_strict(
+        PITCH_TYPE_CODES, list(range(len(PITCH_TYPE_CODES)))).to_numpy().astype(np.int64)
+    shape = (len(batters), len(PITCH_TYPE_CODES))
+    cells = (batter_index, type_index)
+
+    metrics = {}
+    for column in MATRIX_METRICS:
+        matrix = np.zeros(shape)
+        np.add.at(matrix, cells, widen_series(stats[column]).cast(pl.Float64).fill_null(0.0).to_numpy())
+        metrics[column] = matrix
+    counts = np.zeros(shape)
+    np.add.at(counts, cells, 1.0)
+    pa = np.zeros(shape)
+    np.add.at(pa, cells, stats['pa'].fill_null(0).cast(pl.Float64).to_numpy())
+
+    return metrics, counts, pa, batters.rename({NAME_COLUMN: 'batter', 'player_id': 'batter_id'}, strict=False)
+
+def compute_matchup_matrix(all_arsenals, all_batter_stats, min_pa=MIN_BATTER_PA):
+    """Score every qualified batter against every pitcher with masked matrix products.
+
+    Returns a long frame with one row per (batter, pitcher) that has any
+    coverage. Values agree with the per-batter path up to float rounding
+    (the sums run in a different order).
+    """
+    usage, pitchers = build_usage_matrix(all_arsenals)
+    metrics, counts, pa, batters = build_batter_matrices(all_batter_stats, min_pa)
+
+    weights = usage.T
+    total_weight = counts @ weights
+    total_pa = pa @ (weights > 0)
+    covered = total_weight > 0
+    safe_weight = np.where(covered, total_weight, 1.0)
+    averages = {name: (metrics[column] @ weights) / safe_weight
+                for column, name in MATRIX_METRICS.items()}
+    composite = matchup_scores(averages['weighted_ba'], averages['weighted_whiff'],
+                               averages['weighted_k_rate'], averages['weighted_hard_hit'])
+
+    batter_idx, pitcher_idx = np.nonzero(covered)
+    total_pa = total_pa[batter_idx, pitcher_idx].astype(np.int64)
+    frame = pl.DataFrame({
+        **{name: values[batter_idx, pitcher_idx] for name, values in averages.items()},
+        'coverage': total_weight[batter_idx, pitcher_idx],
+        'total_pa': total_pa,
+        'reliability': np.where(total_pa >= 50, 'HIGH', np.where(total_pa >= 20, 'MEDIUM', 'LOW')),
+        'matchup_score': np.round(composite[batter_idx, pitcher_idx], 1),
+    })
+    return pl.concat([batters[batter_idx], pitchers[pitcher_idx], frame], how='horizontal')
+
+def top_k(matrix, column, name, k=10):
+    """Top-K matchups by score for one pitcher (column='pitcher') or batter (column='batter')"""
+    names = matrix[column].unique(maintain_order=True)
+    offsets = lookup_offsets(build_name_index(names.to_list()), name)
+    if not offsets:
+        return matrix.clear()
+    return (
+        matrix
+        .filter(pl.col(column) == names[offsets[0]])
+        .sort('matchup_score', descending=True)
+        .head(k)
+    )
+
+def top_k_all(matrix, column, k=10):
+    """Top-K matchups by score for every pitcher (column='pitcher') or batter (column='batter')"""
+    return (
+        matrix
+        .sort('matchup_score', descending=True)
+        .group_by(column, maintain_order=True)
+        .head(k)
+    )
+
+def print_matchups(matchups):
+    """Print a short table of matchups"""
+    for m in matchups.iter_rows(named=True):
+        print(f"  {m['batter']:<28} vs {m['pitcher']:<28} score {m['matchup_score']:5.1f}  "
+              f"BA {m['weighted_ba']:.3f}  PA {m['total_pa']:>4}  {m['reliability']}")
+
+if __name__ == "__main__":
+    from leaderboard_cache import load_cached_leaderboard
+    from scraper import (
+        ARSENAL_COLUMNS, BATTER_STAT_COLUMNS, BATTER_STAT_ROWS, SEASON_YEAR,
+        statcast_pitch_arsenal_stats_leaderboard, statcast_pitch_arsenals_leaderboard,
+    )
+
+    parser = argparse.ArgumentParser(description="Score every batter against every pitcher")
+    parser.add_argument('--season', type=int, default=SEASON_YEAR)
+    parser.add_argument('--min-pa', type=int, default=MIN_BATTER_PA,
+                        help="Minimum batter PA across pitch types")
+    parser.add_argument('--output', help="Parquet output path (default matchup_matrix_<season>.parquet)")
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--pitcher', help="Show the top-K batters against this pitcher")
+    parser.add_argument('--batter', help="Show the top-K pitchers for this batter")
+    parser.add_argument('--refresh', action='store_true', help="Re-download the leaderboards")
+    args = parser.parse_args()
+
+    all_arsenals = load_cached_leaderboard(statcast_pitch_arsenals_leaderboard, args.season,
+                                           refresh=args.refresh or None, columns=ARSENAL_COLUMNS)
+    all_batter_stats = load_cached_leaderboard(statcast_pitch_arsenal_stats_leaderboard, args.season,
+                                               refresh=args.refresh or None, columns=BATTER_STAT_COLUMNS,
+                                               predicate=BATTER_STAT_ROWS, min_pa=1)
+
+    start = time.perf_counter()
+    matrix = compute_matchup_matrix(all_arsenals, all_batter_stats, args.min_pa)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {matrix['batter'].n_unique()} batters x {matrix['pitcher'].n_unique()} pitchers "
+          f"({len(matrix)} matchups) in {elapsed:.2f}s")
+
+    output = args.output or f"matchup_matrix_{args.season}.parquet"
+    matrix.write_parquet(output)
+    print(f"Saved to {output}")
+
+    if args.pitcher:
+        print(f"\nTop {args.top_k} batters vs {args.pitcher}:")
+        print_matchups(top_k(matrix, 'pitcher', args.pitcher, args.top_k))
+    if args.batter:
+        print(f"\nTop {args.top_k} matchups for {args.batter}:")
+        print_matchups(top_k(matrix, 'batter', args.batter, args.top_k))
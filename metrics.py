@@ -0,0 +1,124 @@
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from datetime import datetime
+
+# Where each run's JSON summary and Prometheus text file go (empty disables the files)
+METRICS_DIR = os.getenv('METRICS_DIR', 'metrics')
+METRIC_PREFIX = 'mlb_scraper'
+
+_spans = {}
+_counters = {}
+_lock = threading.Lock()
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+@contextmanager
+def span(stage):
+    """Time a block under a stage name; nested and concurrent spans are fine"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start)
+
+def timed(stage):
+    """Decorator form of span()"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def record(stage, seconds):
+    """Add one duration to a stage"""
+    with _lock:
+        _spans.setdefault(stage, []).append(seconds)
+
+def incr(name, amount=1):
+    """Bump a counter (cache hits, lookup misses, bytes sent...)"""
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+def reset():
+    """Forget everything recorded so far"""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+def snapshot():
+    """Per-stage count/total/p50/p95/max (seconds) and counters"""
+    with _lock:
+        spans = {stage: list(durations) for stage, durations in _spans.items()}
+        counters = dict(_counters)
+    return {
+        'stages': {
+            stage: {
+                'count': len(durations),
+                'total': sum(durations),
+                'p50': percentile(durations, 50),
+                'p95': percentile(durations, 95),
+                'max': max(durations),
+            }
+            for stage, durations in spans.items()
+        },
+        'counters': counters,
+    }
+
+def prometheus_text(stats=None):
+    """Stages and counters in the Prometheus text exposition format"""
+    stats = stats or snapshot()
+    name = f"{METRIC_PREFIX}_stage_seconds"
+    lines = [f"# HELP {name} Time spent per pipeline stage.", f"# TYPE {name} summary"]
+    for stage, s in sorted(stats['stages'].items()):
+        labels = f'stage="{stage}"'
+        lines.append(f'{name}{{{labels},quantile="0.5"}} {s["p50"]:.6f}')
+        lines.append(f'{name}{{{labels},quantile="0.95"}} {s["p95"]:.6f}')
+        lines.append(f'{name}_sum{{{labels}}} {s["total"]:.6f}')
+        lines.append(f'{name}_count{{{labels}}} {s["count"]}')
+    for counter, value in sorted(stats['counters'].items()):
+        metric = f"{METRIC_PREFIX}_{counter}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    return '\n'.join(lines) + '\n'
+
+def write_run_summary(extra=None, metrics_dir=None):
+    """Write run_summary.json and metrics.prom for the latest run; returns the summary"""
+    stats = snapshot()
+    summary = dict(extra or {}, finished_at=datetime.now().isoformat(timespec='seconds'), **stats)
+    metrics_dir = METRICS_DIR if metrics_dir is None else metrics_dir
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for filename, content in (('run_summary.json', json.dumps(summary, indent=2, default=str)),
+                                  ('metrics.prom', prometheus_text(stats))):
+            path = os.path.join(metrics_dir, filename)
+            # Written atomically so a textfile collector never reads half a file
+            with open(f"{path}.tmp", 'w') as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+    return summary
+
+def print_stage_report(stats=None):
+    """Print the per-stage timing table and counters"""
+    stats = stats or snapshot()
+    if not stats['stages'] and not stats['counters']:
+        return
+    width = max(len(name) for name in list(stats['stages']) + list(stats['counters']))
+    print("\n📈 Stage timings:")
+    for stage, s in sorted(stats['stages'].items(), key=lambda item: -item[1]['total']):
+        print(f"   {stage:<{width}} total {s['total']:>7.3f}s  n {s['count']:>4}  "
+              f"p50 {s['p50'] * 1000:>8.2f}ms  max {s['max'] * 1000:>8.2f}ms")
+    for counter, value in sorted(stats['counters'].items()):
+        print(f"   {counter:<{width}} {value}")
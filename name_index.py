@@ -0,0 +1,90 @@
+import unicodedata
+
+import metrics
+from frame_cache import cached_for_frame
+
+NAME_SUFFIXES = ('jr', 'sr', 'ii', 'iii', 'iv')
+
+def normalize_name(name):
+    """Lowercase, strip accents and periods, and collapse whitespace ('Acuña Jr.' -> 'acuna jr')"""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.lower().replace('.', '').split())
+
+def split_name(name):
+    """Split 'Last, First' or 'First Last [Jr.]' into normalized (last, first)"""
+    if ',' in name:
+        last_name, first_name = name.split(',', 1)
+        return normalize_name(last_name), normalize_name(first_name)
+
+    parts = normalize_name(name).split()
+    if len(parts) >= 3 and parts[-1] in NAME_SUFFIXES:
+        return ' '.join(parts[-2:]), ' '.join(parts[:-2])
+    if len(parts) >= 2:
+        return parts[-1], ' '.join(parts[:-1])
+    return ' '.join(parts), ''
+
+def last_name_keys(last_name):
+    """Last-name keys to index/probe: the name itself, plus the name without a Jr./Sr./II suffix"""
+    keys = [last_name]
+    parts = last_name.split()
+    if len(parts) >= 2 and parts[-1] in NAME_SUFFIXES:
+        keys.append(' '.join(parts[:-1]))
+    return keys
+
+def build_name_index(names):
+    """Map normalized full names and last names to row offsets.
+
+    'full' maps 'last|first' -> list of row offsets (a batter has one row per
+    pitch type). 'last' maps a last name -> list of full keys in frame order,
+    so surname-only fallbacks can still pick a single player.
+    """
+    full = {}
+    last = {}
+    for offset, name in enumerate(names):
+        if not name:
+            continue
+        last_name, first_name = split_name(name)
+        key = f"{last_name}|{first_name}"
+        if key not in full:
+            full[key] = []
+            for last_key in last_name_keys(last_name):
+                last.setdefault(last_key, []).append(key)
+        full[key].append(offset)
+    return {'full': full, 'last': last}
+
+def lookup_offsets(index, name):
+    """Find row offsets for a player: exact full name first, then last name.
+
+    On a last-name fallback with several candidates, a candidate sharing the
+    first initial wins (Mike vs Michael), otherwise the first in frame order.
+    """
+    metrics.incr('name_lookups')
+    last_name, first_name = split_name(name)
+    offsets = index['full'].get(f"{last_name}|{first_name}")
+    if offsets:
+        return offsets
+
+    for last_key in last_name_keys(last_name):
+        candidates = index['last'].get(last_key)
+        if not candidates:
+            continue
+        metrics.incr('name_lookup_fallbacks')
+        if first_name and len(candidates) > 1:
+            for candidate in candidates:
+                if candidate.split('|', 1)[1][:1] == first_name[:1]:
+                    return index['full'][candidate]
+        return index['full'][candidates[0]]
+    metrics.incr('name_lookup_misses')
+    return []
+
+def get_name_index(df, column):
+    """Return the name index for a frame's name column, building it once per loaded frame"""
+    return cached_for_frame(df, ('name_index', column),
+                            lambda frame: build_name_index(frame.get_column(column).to_list()))
+
+def lookup_rows(df, column, name):
+    """Row offsets in `df` for the player `name`, via the cached name index"""
+    return lookup_offsets(get_name_index(df, column), name)
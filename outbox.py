@@ -0,0 +1,193 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from contextlib import closing, contextmanager
+
+import http_client
+import metrics
+
+# SQLite file holding undelivered payloads - put it on a persistent disk on Render
+OUTBOX_PATH = os.getenv('WEBHOOK_OUTBOX_PATH', 'webhook_outbox.sqlite3')
+
+# Give up on a payload after this many attempts (it stays in the table as 'dead')
+MAX_ATTEMPTS = int(os.getenv('WEBHOOK_OUTBOX_MAX_ATTEMPTS', '12'))
+BACKOFF_BASE = float(os.getenv('WEBHOOK_OUTBOX_BACKOFF_BASE', '2'))
+BACKOFF_MAX = float(os.getenv('WEBHOOK_OUTBOX_BACKOFF_MAX', '900'))
+POLL_INTERVAL = float(os.getenv('WEBHOOK_OUTBOX_POLL_INTERVAL', '1'))
+
+# Delivered rows are kept this long (for idempotent re-enqueues and inspection), then deleted
+RETENTION_HOURS = float(os.getenv('WEBHOOK_OUTBOX_RETENTION_HOURS', '168'))
+PRUNE_INTERVAL = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    delivered_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+_worker = {'thread': None, 'stop': None}
+
+def connect(path=None):
+    """Open the outbox database (one connection per thread)"""
+    conn = sqlite3.connect(path or OUTBOX_PATH, timeout=30)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+@contextmanager
+def connection(conn=None, path=None):
+    """Use `conn` if given, otherwise open one for the block and close it afterwards"""
+    if conn is not None:
+        yield conn
+        return
+    with closing(connect(path)) as conn:
+        yield conn
+
+def enqueue(conn, url, body, headers, idempotency_key):
+    """Queue a payload for delivery; re-enqueuing the same key is a no-op. Returns True if queued"""
+    headers = dict(headers, **{'Idempotency-Key': idempotency_key})
+    now = time.time()
+    with conn:
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO outbox (idempotency_key, url, headers, body, next_attempt_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (idempotency_key, url, json.dumps(headers), sqlite3.Binary(body), now, now))
+    return cursor.rowcount == 1
+
+def backoff_delay(attempts):
+    """Full-jitter exponential backoff for the next attempt"""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempts)))
+
+def deliver_due(conn, limit=50):
+    """Try every payload that is due once. Returns (delivered, failed)"""
+    now = time.time()
+    rows = conn.execute(
+        "SELECT id, url, headers, body, attempts FROM outbox "
+        "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+        (now, limit)).fetchall()
+
+    delivered = failed = 0
+    for row_id, url, headers, body, attempts in rows:
+        try:
+            # The outbox owns the retry schedule, so the client only retries briefly
+            with metrics.span('outbox_delivery'):
+                response = http_client.post(url, endpoint='webhook', data=body, headers=json.loads(headers),
+                                            timeout=(5, 30), retries=1, max_elapsed=45)
+                response.raise_for_status()
+        except Exception as e:
+            failed += 1
+            attempts += 1
+            status = 'dead' if attempts >= MAX_ATTEMPTS else 'pending'
+            with conn:
+                conn.execute(
+                    "UPDATE outbox SET attempts = ?, status = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    (attempts, status, time.time() + backoff_delay(attempts), str(e)[:500], row_id))
+            if status == 'dead':
+                print(f"   Outbox: giving up on payload {row_id} after {attempts} attempts: {e}")
+            continue
+
+        delivered += 1
+        metrics.incr('webhook_bytes_sent', len(body))
+        with conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'delivered', attempts = ?, delivered_at = ?, body = x'' WHERE id = ?",
+                (attempts + 1, time.time(), row_id))
+    return delivered, failed
+
+def prune_delivered(conn, retention_hours=None):
+    """Delete payloads delivered longer ago than the retention window. Returns rows deleted"""
+    retention_hours = RETENTION_HOURS if retention_hours is None else retention_hours
+    with conn:
+        cursor = conn.execute("DELETE FROM outbox WHERE status = 'delivered' AND delivered_at < ?",
+                              (time.time() - retention_hours * 3600,))
+    if cursor.rowcount:
+        # Hand the freed pages back and reset the WAL file rather than letting it sit at its peak size
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return cursor.rowcount
+
+def pending_count(conn):
+    """Number of payloads still waiting for delivery"""
+    return conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+def status_counts(conn):
+    """Payload counts by status"""
+    return dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+def _worker_loop(stop, path, poll_interval):
+    # One connection for the worker's lifetime
+    with closing(connect(path)) as conn:
+        pruned_at = 0.0
+        while not stop.is_set():
+            try:
+                delivered, _ = deliver_due(conn)
+                if time.time() - pruned_at > PRUNE_INTERVAL:
+                    prune_delivered(conn)
+                    pruned_at = time.time()
+            except Exception as e:
+                print(f"   Outbox worker error: {e}")
+                delivered = 0
+            # Keep going straight away while there is work, otherwise poll
+            if not delivered:
+                stop.wait(poll_interval)
+
+def start_worker(path=None, poll_interval=None):
+    """Start the background delivery thread (also drains whatever earlier runs left behind)"""
+    if _worker['thread'] is not None and _worker['thread'].is_alive():
+        return
+    stop = threading.Event()
+    thread = threading.Thread(target=_worker_loop, name='webhook-outbox', daemon=True,
+                              args=(stop, path, poll_interval or POLL_INTERVAL))
+    _worker.update(thread=thread, stop=stop)
+    thread.start()
+
+def stop_worker(wait_seconds=0, path=None):
+    """Give the worker up to wait_seconds to empty the queue, then stop it. Returns payloads left pending"""
+    with closing(connect(path)) as conn:
+        deadline = time.time() + wait_seconds
+        while pending_count(conn) and time.time() < deadline:
+            time.sleep(0.2)
+        remaining = pending_count(conn)
+    if _worker['thread'] is not None:
+        _worker['stop'].set()
+        _worker['thread'].join(timeout=60)
+        _worker.update(thread=None, stop=None)
+    return remaining
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver queued webhook payloads")
+    parser.add_argument('--path', default=OUTBOX_PATH)
+    parser.add_argument('--status', action='store_true', help="Only show queue counts")
+    parser.add_argument('--timeout', type=float, default=300,
+                        help="Seconds to keep retrying before exiting")
+    args = parser.parse_args()
+
+    with closing(connect(args.path)) as conn:
+        print(f"Outbox {args.path}: {status_counts(conn)}")
+        if not args.status:
+            deadline = time.time() + args.timeout
+            while pending_count(conn) and time.time() < deadline:
+                delivered, failed = deliver_due(conn)
+                if delivered or failed:
+                    print(f"   Delivered {delivered}, failed {failed}")
+                else:
+                    time.sleep(POLL_INTERVAL)
+            pruned = prune_delivered(conn)
+            if pruned:
+                print(f"   Removed {pruned} payloads delivered over {RETENTION_HOURS:g}h ago")
+            print(f"Outbox {args.path}: {status_counts(conn)}")
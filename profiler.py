@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import pstats
+import threading
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+
+# Profiles are written to PROFILE_DIR/<timestamp>_<pid>/
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+
+_state = {'backend': None, 'scope': None, 'dir': None, 'active': None, 'meta': {}}
+
+class SamplingProfiler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks"""
+
+    def __init__(self, interval=None, thread_id=None):
+        self.interval = interval or SAMPLE_INTERVAL
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name='profiler-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, out_dir):
+        """stacks.collapsed (flamegraph.pl / speedscope input) and top.txt by self samples"""
+        with open(os.path.join(out_dir, 'stacks.collapsed'), 'w') as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+        leaves = {}
+        for stack, count in self.stacks.items():
+            leaf = stack.rsplit(';', 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        with open(os.path.join(out_dir, 'top.txt'), 'w') as f:
+            f.write(f"{self.samples} samples every {self.interval * 1000:g}ms\n\n")
+            for leaf, count in sorted(leaves.items(), key=lambda item: -item[1])[:40]:
+                f.write(f"{count:>7}  {count / max(self.samples, 1) * 100:5.1f}%  {leaf}\n")
+
+class CProfileBackend:
+    """Deterministic cProfile of the section"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, out_dir):
+        """profile.pstats (snakeviz / pstats input) and top.txt by cumulative time"""
+        self.profile.dump_stats(os.path.join(out_dir, 'profile.pstats'))
+        with open(os.path.join(out_dir, 'top.txt'), 'w') as f:
+            stats = pstats.Stats(self.profile, stream=f)
+            stats.sort_stats('cumulative').print_stats(40)
+            stats.sort_stats('tottime').print_stats(25)
+
+BACKENDS = {'cprofile': CProfileBackend, 'sample': SamplingProfiler}
+
+def configure(backend, scope='loop', root=None):
+    """Turn profiling on for one scope ('loop' or 'run'); returns the output directory"""
+    # The pid keeps two runs started in the same second apart
+    out_dir = os.path.join(root or PROFILE_DIR, f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}")
+    _state.update(backend=backend, scope=scope, dir=out_dir, active=None, meta={})
+    return out_dir
+
+def annotate(**fields):
+    """Add slate/data sizes (or anything else) to the profile's meta.json"""
+    _state['meta'].update(fields)
+
+def start(scope):
+    """Start profiling if this is the configured scope"""
+    if _state['backend'] is None or _state['scope'] != scope or _state['active'] is not None:
+        return
+    profiler = BACKENDS[_state['backend']]()
+    _state['active'] = (profiler, time.perf_counter())
+    # A run that dies or exits early is exactly the one worth looking at
+    atexit.register(stop, scope)
+    profiler.start()
+
+def stop(scope):
+    """Stop profiling and write pstats/collapsed stacks plus meta.json"""
+    if _state['scope'] != scope or _state['active'] is None:
+        return
+    profiler, started = _state['active']
+    profiler.stop()
+    _state['active'] = None
+    atexit.unregister(stop)
+
+    out_dir = _state['dir']
+    os.makedirs(out_dir, exist_ok=True)
+    profiler.write(out_dir)
+    meta = dict(_state['meta'], backend=_state['backend'], scope=scope,
+                seconds=round(time.perf_counter() - started, 4),
+                argv=sys.argv, git_commit=git_commit(), python=sys.version.split()[0])
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2, default=str)
+    print(f"🔬 {_state['backend']} profile of the {scope} written to {out_dir}/")
+
+@contextmanager
+def section(scope, **fields):
+    """Profile the enclosed block when it is the configured scope"""
+    annotate(**fields)
+    start(scope)
+    try:
+        yield
+    finally:
+        stop(scope)
+
+def git_commit():
+    """Short commit hash of the working tree, if available"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from daemon import ResidentData
+from metrics import percentile
+from report_writer import dumps
+from scraper import (
+    calculate_weighted_metrics, fetch_matchups, get_batter_baseline, get_batter_vs_pitches,
+    get_pitcher_arsenal_with_usage, iter_game_reports, matchup_entry,
+)
+
+QUERY_HOST = os.getenv('QUERY_HOST', '127.0.0.1')
+QUERY_PORT = int(os.getenv('QUERY_PORT', '8765'))
+
+# Cached responses (the cache is emptied whenever the leaderboards reload)
+QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', '2048'))
+# Today's slate depends on the matchup API, so it is only reused this long
+SLATE_TTL_SECONDS = float(os.getenv('QUERY_SLATE_TTL', '120'))
+
+# How many recent latencies per endpoint feed the percentiles
+LATENCY_WINDOW = 5000
+
+class QueryError(Exception):
+    """A request the service can't answer, with the HTTP status to return"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def score_matchup(batter_name, pitcher_name, frames):
+    """Score one batter against one pitcher with the scraper's own weighted-metrics logic"""
+    all_arsenals, all_batter_stats, batting_baselines, _ = frames
+    arsenal = get_pitcher_arsenal_with_usage(pitcher_name, all_arsenals)
+    if not arsenal:
+        raise QueryError(404, f"No arsenal found for pitcher {pitcher_name!r}")
+    stats = get_batter_vs_pitches(batter_name, list(arsenal.keys()), all_batter_stats)
+    weighted_result = calculate_weighted_metrics(stats, arsenal)
+    if weighted_result is None:
+        return None
+    entry = matchup_entry(batter_name, None, pitcher_name, weighted_result, stats,
+                          get_batter_baseline(batter_name, batting_baselines))
+    # Ad-hoc queries have no team context
+    del entry['team']
+    return entry
+
+class QueryService:
+    """Answers matchup questions from resident leaderboards, with an LRU response cache"""
+
+    def __init__(self, data=None):
+        self.data = data or ResidentData()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._latencies = {}
+        self._stats_lock = threading.Lock()
+        self.counters = {'requests': 0, 'cache_hits': 0, 'cache_misses': 0, 'errors': 0}
+        self.started_at = time.time()
+
+    def ensure_loaded(self):
+        """Load (or reload stale) leaderboards; concurrent requests wait for one load"""
+        if not self.data.is_stale():
+            return
+        with self._load_lock:
+            if self.data.is_stale() and self.data.load():
+                with self._cache_lock:
+                    self._cache.clear()
+        if self.data.frames is None:
+            raise QueryError(503, "Leaderboards are not loaded")
+
+    def cached(self, key, build, ttl=None):
+        """Serialized response for key, building it on a miss"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                self._cache.move_to_end(key)
+                self.counters['cache_hits'] += 1
+                return entry[0]
+            self.counters['cache_misses'] += 1
+
+        body = dumps(build(), compact=True)
+        with self._cache_lock:
+            self._cache[key] = (body, time.time() + ttl if ttl else None)
+            while len(self._cache) > QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return body
+
+    def score(self, params):
+        batter, pitcher = require(params, 'batter'), require(params, 'pitcher')
+        result = score_matchup(batter, pitcher, self.data.frames)
+        if result is None:
+            raise QueryError(404, f"No pitch-type data for {batter!r} against {pitcher!r}'s arsenal")
+        return result
+
+    def lineup(self, params):
+        pitcher = require(params, 'pitcher')
+        batters = params.get('batter') or []
+        if not batters:
+            raise QueryError(400, "Pass one or more batter= parameters")
+        results = []
+        for batter in batters:
+            result = score_matchup(batter, pitcher, self.data.frames)
+            results.append(result or {'batter': batter, 'vs_pitcher': pitcher, 'matchup_score': None})
+        return {'pitcher': pitcher, 'matchups': results}
+
+    def slate(self, params):
+        api_data = fetch_matchups()
+        if not api_data:
+            raise QueryError(502, "No matchups returned by the matchup API")
+        reports = list(iter_game_reports(api_data, *self.data.frames))
+        return {
+            'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
+            'date': datetime.now().strftime("%Y-%m-%d"),
+            'reports': reports,
+            'games_processed': len(reports),
+        }
+
+    def handle(self, path, params):
+        """Route a GET request; returns serialized JSON"""
+        if path == '/health':
+            return dumps({'ok': True, 'loaded': self.data.frames is not None}, compact=True)
+        if path == '/metrics':
+            return dumps(self.metrics(), compact=True)
+        routes = {'/score': (self.score, None), '/lineup': (self.lineup, None),
+                  '/slate': (self.slate, SLATE_TTL_SECONDS)}
+        if path not in routes:
+            raise QueryError(404, f"Unknown endpoint {path}")
+        self.ensure_loaded()
+        handler, ttl = routes[path]
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        return self.cached(key, lambda: handler(params), ttl=ttl)
+
+    def record(self, endpoint, seconds, failed=False):
+        with self._stats_lock:
+            latencies = self._latencies.setdefault(endpoint, [])
+            latencies.append(seconds)
+            if len(latencies) > LATENCY_WINDOW:
+                del latencies[:len(latencies) - LATENCY_WINDOW]
+            self.counters['requests'] += 1
+            if failed:
+                self.counters['errors'] += 1
+
+    def metrics(self):
+        """Request counters, cache hit rate and per-endpoint p50/p99 latency (milliseconds)"""
+        with self._stats_lock:
+            latencies = {endpoint: list(values) for endpoint, values in self._latencies.items()}
+            counters = dict(self.counters)
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'data_loaded_at': self.data.loaded_at,
+            'cached_responses': len(self._cache),
+            **counters,
+            'endpoints': {
+                endpoint: {
+                    'count': len(values),
+                    'p50_ms': round(percentile(values, 50) * 1000, 3),
+                    'p99_ms': round(percentile(values, 99) * 1000, 3),
+                }
+                for endpoint, values in latencies.items()
+            },
+        }
+
+def require(params, name):
+    """First value of a required query parameter"""
+    values = params.get(name)
+    if not values or not values[0].strip():
+        raise QueryError(400, f"Missing required parameter {name!r}")
+    return values[0].strip()
+
+def make_handler(service):
+    """Request handler class bound to a QueryService"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            started = time.perf_counter()
+            url = urlsplit(self.path)
+            status = 200
+            try:
+                body = service.handle(url.path, parse_qs(url.query))
+            except QueryError as e:
+                status, body = e.status, dumps({'error': str(e)}, compact=True)
+            except Exception as e:
+                status, body = 500, dumps({'error': f"{type(e).__name__}: {e}"}, compact=True)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            service.record(url.path, time.perf_counter() - started, failed=status >= 500)
+
+        def log_message(self, format, *args):
+            # Per-request logging would dominate the latency being measured
+            pass
+
+    return Handler
+
+def serve(host=None, port=None):
+    """Load the leaderboards and answer queries until interrupted"""
+    service = QueryService()
+    service.ensure_loaded()
+    server = ThreadingHTTPServer((host or QUERY_HOST, port or QUERY_PORT), make_handler(service))
+    print(f"Query service listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    print("   /score?batter=&pitcher=  /lineup?pitcher=&batter=...  /slate  /metrics  /health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping query service")
+    finally:
+        server.server_close()
+        print(json.dumps(service.metrics(), indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP queries over the in-memory matchup engine")
+    parser.add_argument('--host', default=QUERY_HOST)
+    parser.add_argument('--port', type=int, default=QUERY_PORT)
+    args = parser.parse_args()
+    serve(args.host, args.port)
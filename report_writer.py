@@ -0,0 +1,85 @@
+import os
+import json
+
+import metrics
+
+# orjson is much faster; fall back to the stdlib if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj, compact=False):
+    """Serialize to UTF-8 JSON bytes, indented unless compact"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+class StreamingReportWriter:
+    """Write the run payload to disk one game report at a time.
+
+    The file has the same shape as the old json.dump output - a header
+    object with a 'reports' list and 'games_processed' - but no report is
+    kept in memory after it is written. Sinks are called with
+    (report, report_bytes) for every report, so delivery can stream too.
+    """
+
+    def __init__(self, path, header, compact=False, sinks=None):
+        self.path = path
+        self.header = header
+        self.compact = compact
+        self.sinks = list(sinks or [])
+        self.count = 0
+        self.bytes_written = 0
+        self._tmp_path = f"{path}.tmp"
+        self._file = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write(self, data):
+        self._file.write(data)
+        self.bytes_written += len(data)
+
+    def open(self):
+        """Start the file with the header fields and an open 'reports' list"""
+        self._file = open(self._tmp_path, 'wb')
+        header = dumps(self.header, compact=True)
+        # Reuse the serialized header, minus its closing brace
+        self._write(header[:-1] + (b',' if self.header else b'') + b'"reports":[')
+
+    def write_report(self, report):
+        """Serialize one game report, append it to the file and pass it to the sinks"""
+        with metrics.span('serialize_report'):
+            data = dumps(report, compact=self.compact)
+        separator = b',' if self.count else b''
+        if self.compact:
+            self._write(separator + data)
+        else:
+            self._write(separator + b'\n    ' + data.replace(b'\n', b'\n    '))
+        self.count += 1
+        for sink in self.sinks:
+            sink(report, data)
+
+    def close(self):
+        """Finish the JSON document and move it into place"""
+        footer = b'\n' if not self.compact and self.count else b''
+        self._write(footer + b'],"games_processed":' + str(self.count).encode('ascii') + b'}\n')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+        metrics.incr('report_bytes_written', self.bytes_written)
+
+    def abort(self):
+        """Drop a partial file after an error"""
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
@@ -1,46 +1,112 @@
-import pybaseballstats
-from pybaseballstats.statcast_leaderboards import (
-    statcast_pitch_arsenals_leaderboard,
-    statcast_pitch_arsenal_stats_leaderboard
-)
-from pybaseballstats.fangraphs import fangraphs_batting_range, fangraphs_pitching_range
 import polars as pl
-import json
 import re
-import requests
 import os
+import sys
+import time
+import argparse
 from datetime import datetime
+import http_archive
+import http_client
+import metrics
+import profiler
+from compact_dtypes import compact_with_report, print_memory_report, row_dict, widen_floats
+from leaderboard_cache import load_cached_leaderboard
+from loaders import load_concurrently, print_timing_report
+from crosswalk import (
+    FANGRAPHS_ID_COLUMNS, FANGRAPHS_MLBAM_COLUMNS, activate_crosswalk, player_rows, refresh_crosswalk,
+)
+from slate_engine import iter_slate_scores
+from shrinkage import shrink_batter_stats
+from arsenal_table import PITCH_TYPES, PITCHER_ID_COLUMNS, pitcher_arsenal_slice, prepare_arsenals
+from report_writer import StreamingReportWriter
+from webhook_delivery import (
+    ChunkedWebhookSink, compress, enqueue_payload, new_batch_id, outbox_deliverer,
+    WEBHOOK_CHUNKING, WEBHOOK_COMPRESSION
+)
+import outbox
+from delta_publish import DeltaSink, game_numbers, load_snapshot, save_snapshot, serialize_delta
 
 # Your actual API endpoint
 API_URL = "https://mlb-matchup-analysis-api.onrender.com/"
-SEASON_YEAR = 2025  # Current season
+# Current season - set SEASON_YEAR to run against another year
+SEASON_YEAR = int(os.getenv('SEASON_YEAR', '2025'))
 
 # Webhook URL - set this as environment variable on Render
 WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')
 
-def load_baseline_stats(season_year):
+# Deliver through the durable SQLite outbox (set WEBHOOK_OUTBOX=0 to post directly)
+USE_OUTBOX = os.getenv('WEBHOOK_OUTBOX', '1') not in ('0', 'false', 'no')
+# How long a run waits for the outbox to drain before leaving the rest for the next run
+OUTBOX_FLUSH_SECONDS = float(os.getenv('WEBHOOK_OUTBOX_FLUSH_SECONDS', '60'))
+
+# Only the columns the pipeline reads are loaded; the leaderboard cache keeps everything
+ARSENAL_COLUMNS = ['last_name, first_name', *PITCHER_ID_COLUMNS] + [
+    f'{pitch_type}_{metric}' for pitch_type in PITCH_TYPES for metric in ('avg_speed', 'usage_rate')]
+BATTER_STAT_COLUMNS = ['last_name, first_name', 'player_id', 'pitch_type', 'ba', 'est_ba', 'slg',
+                       'hard_hit_percent', 'whiff_percent', 'k_percent', 'pa']
+BATTING_BASELINE_COLUMNS = ['Name', *FANGRAPHS_ID_COLUMNS, *FANGRAPHS_MLBAM_COLUMNS, 'AVG', 'K%', 'OPS', 'PA']
+PITCHING_BASELINE_COLUMNS = ['Name', *FANGRAPHS_ID_COLUMNS, *FANGRAPHS_MLBAM_COLUMNS, 'K%', 'ERA', 'WHIP', 'IP']
+
+# Rows for pitch types no arsenal reports (e.g. knuckle curves) can never be weighted
+BATTER_STAT_ROWS = pl.col('pitch_type').is_in([pitch_type.upper() for pitch_type in PITCH_TYPES])
+
+# Regress batter-by-pitch-type stats toward league/baseline priors at load time (off by default)
+SHRINKAGE = os.getenv('SHRINKAGE', '') in ('1', 'true', 'yes')
+# Earlier seasons from the warehouse folded into the shrinkage prior
+SHRINKAGE_PRIOR_SEASONS = int(os.getenv('SHRINKAGE_PRIOR_SEASONS', '0'))
+
+# Per-source load timeouts (seconds)
+MATCHUPS_TIMEOUT = float(os.getenv('MATCHUPS_TIMEOUT', '120'))
+SAVANT_TIMEOUT = float(os.getenv('SAVANT_TIMEOUT', '300'))
+FANGRAPHS_TIMEOUT = float(os.getenv('FANGRAPHS_TIMEOUT', '180'))
+
+# pybaseballstats is slow to import and only needed on a cache miss, so every
+# leaderboard call imports it on first use. The wrappers keep the library's
+# function names, which the leaderboard cache uses for its paths.
+def statcast_pitch_arsenals_leaderboard(season, **params):
+   """Savant pitch arsenal leaderboard (speed and usage by pitch type)"""
+   from pybaseballstats.statcast_leaderboards import statcast_pitch_arsenals_leaderboard
+   return statcast_pitch_arsenals_leaderboard(season, **params)
+
+def statcast_pitch_arsenal_stats_leaderboard(season, **params):
+   """Savant batter results by pitch type"""
+   from pybaseballstats.statcast_leaderboards import statcast_pitch_arsenal_stats_leaderboard
+   return statcast_pitch_arsenal_stats_leaderboard(season, **params)
+
+def fangraphs_batting_season(season_year, min_pa=50):
+   """FanGraphs batting leaderboard for one season"""
+   from pybaseballstats.fangraphs import fangraphs_batting_range
+   return fangraphs_batting_range(start_year=season_year, end_year=season_year, min_pa=min_pa)
+
+def fangraphs_pitching_season(season_year, min_ip=10):
+   """FanGraphs pitching leaderboard for one season"""
+   from pybaseballstats.fangraphs import fangraphs_pitching_range
+   return fangraphs_pitching_range(start_year=season_year, end_year=season_year, min_ip=min_ip)
+
+@metrics.timed('baseline_load')
+def load_baseline_stats(season_year, refresh=None):
    """Load baseline season stats from FanGraphs"""
    try:
        print("📊 Loading baseline season stats from FanGraphs...")
-       batting_baselines = fangraphs_batting_range(start_year=season_year, end_year=season_year, min_pa=50)
-       pitching_baselines = fangraphs_pitching_range(start_year=season_year, end_year=season_year, min_ip=10)
+       batting_baselines = load_cached_leaderboard(fangraphs_batting_season, season_year, refresh=refresh,
+                                                   columns=BATTING_BASELINE_COLUMNS, min_pa=50)
+       pitching_baselines = load_cached_leaderboard(fangraphs_pitching_season, season_year, refresh=refresh,
+                                                    columns=PITCHING_BASELINE_COLUMNS, min_ip=10)
        print(f"   Loaded {len(batting_baselines)} batters and {len(pitching_baselines)} pitchers")
        return batting_baselines, pitching_baselines
    except Exception as e:
        print(f"   Warning: Could not load baseline stats: {e}")
        return None, None
 
+@metrics.timed('batter_baseline_lookup')
 def get_batter_baseline(batter_name, batting_baselines):
    """Get batter's season baseline stats"""
    if batting_baselines is None:
        return None
    try:
-       last_name = batter_name.split(',')[0].strip()
-       matching_batters = batting_baselines.filter(
-           pl.col('Name').str.to_lowercase().str.contains(last_name.lower())
-       )
-       if len(matching_batters) > 0:
-           batter_row = matching_batters.row(0, named=True)
+       offsets = player_rows(batting_baselines, 'Name', batter_name)
+       if offsets:
+           batter_row = row_dict(batting_baselines, offsets[0])
            return {
                'season_avg': batter_row.get('AVG', 0.248),
                'season_k_pct': batter_row.get('K%', 0.235) * 100 if batter_row.get('K%') else 23.5,
@@ -56,12 +122,9 @@ def get_pitcher_baseline(pitcher_name, pitching_baselines):
    if pitching_baselines is None:
        return None
    try:
-       last_name = pitcher_name.split(',')[0].strip()
-       matching_pitchers = pitching_baselines.filter(
-           pl.col('Name').str.to_lowercase().str.contains(last_name.lower())
-       )
-       if len(matching_pitchers) > 0:
-           pitcher_row = matching_pitchers.row(0, named=True)
+       offsets = player_rows(pitching_baselines, 'Name', pitcher_name)
+       if offsets:
+           pitcher_row = row_dict(pitching_baselines, offsets[0])
            return {
                'season_k_pct': pitcher_row.get('K%', 0.235) * 100 if pitcher_row.get('K%') else 23.5,
                'season_era': pitcher_row.get('ERA', 4.25),
@@ -72,11 +135,13 @@ def get_pitcher_baseline(pitcher_name, pitching_baselines):
        print(f"   Warning: Error getting baseline for {pitcher_name}: {e}")
    return None
 
+@metrics.timed('matchup_fetch')
 def fetch_matchups():
     """Fetch today's matchups from your API"""
     try:
         print(f"Fetching matchups from {API_URL}")
-        response = requests.get(API_URL)
+        # The Render API cold-starts, so allow a long read but retry 5xx/timeouts with backoff
+        response = http_client.get(API_URL, endpoint='matchups', timeout=(5, 60))
         response.raise_for_status()
         data = response.json()
         print(f"Successfully fetched {len(data)} matchups")
@@ -126,45 +191,22 @@ def parse_batter_name(lineup_string):
 
 def get_pitcher_arsenal_with_usage(pitcher_name, all_arsenals):
     """Get pitcher's arsenal with usage rates"""
-    last_name = pitcher_name.split(',')[0].lower()
-    pitcher_data = all_arsenals.filter(
-        pl.col('last_name, first_name').str.to_lowercase().str.contains(last_name)
-    )
+    offsets = player_rows(all_arsenals, 'last_name, first_name', pitcher_name)
     
-    if len(pitcher_data) == 0:
+    if not offsets:
         return None
     
-    pitcher_row = pitcher_data.row(0, named=True)
-    
-    pitch_types = {
-        'ff': 'Four-Seam', 'si': 'Sinker', 'fc': 'Cutter',
-        'sl': 'Slider', 'ch': 'Changeup', 'cu': 'Curveball',
-        'st': 'Sweeper', 'fs': 'Splitter', 'kn': 'Knuckleball',
-        'sv': 'Slurve'
-    }
+    # Slice of the long arsenal table built at load time (usage already normalized)
+    pitches = pitcher_arsenal_slice(all_arsenals, offsets[0])
     
     arsenal = {}
-    total_usage = 0.0
-    
-    # First pass: collect all pitches with usage > 0
-    for abbr, full_name in pitch_types.items():
-        speed_col = f'{abbr}_avg_speed'
-        usage_col = f'{abbr}_usage_rate'
-        
-        if speed_col in pitcher_row and pitcher_row[speed_col] is not None:
-            usage = pitcher_row.get(usage_col, 0.0) or 0.0
-            if usage > 0:
-                arsenal[abbr.upper()] = {
-                    'name': full_name,
-                    'avg_speed': pitcher_row[speed_col],
-                    'usage_rate': usage / 100.0  # Convert to decimal
-                }
-                total_usage += usage
-    
-    # Normalize usage rates to ensure they sum to 1.0
-    if total_usage > 0:
-        for pitch in arsenal.values():
-            pitch['usage_rate'] = pitch['usage_rate'] * (100.0 / total_usage)
+    for pitch in pitches.select(['pitch_type', 'pitch_name', 'avg_speed', 'usage_rate']).iter_rows():
+        pitch_type, pitch_name, avg_speed, usage_rate = pitch
+        arsenal[pitch_type] = {
+            'name': pitch_name,
+            'avg_speed': avg_speed,
+            'usage_rate': usage_rate
+        }
     
     return arsenal
 
@@ -265,77 +307,86 @@ def calculate_matchup_score(metrics):
 
 def get_batter_vs_pitches(batter_name, pitch_types, all_batter_stats):
     """Get batter's stats against specific pitch types"""
-    last_name = batter_name.split(',')[0].lower()
-    
-    # First try exact last name match
-    batter_data = all_batter_stats.filter(
-        pl.col('last_name, first_name').str.to_lowercase().str.contains(last_name)
-    )
-    
-    if len(batter_data) == 0:
-        # Try without accents
-        last_name_no_accent = last_name.replace('á', 'a').replace('é', 'e').replace('í', 'i').replace('ó', 'o').replace('ú', 'u').replace('ñ', 'n')
-        if last_name_no_accent != last_name:
-            batter_data = all_batter_stats.filter(
-                pl.col('last_name, first_name').str.to_lowercase().str.contains(last_name_no_accent)
-            )
+    # Exact full-name match first, then last name (accents are normalized away in the index)
+    offsets = player_rows(all_batter_stats, 'last_name, first_name', batter_name)
+    batter_data = all_batter_stats[offsets]
     
     if len(batter_data) > 0:
         # Filter by pitch types
         batter_pitch_data = batter_data.filter(pl.col('pitch_type').is_in(pitch_types))
         
         if len(batter_pitch_data) > 0:
-            return batter_pitch_data.select(['pitch_type', 'ba', 'est_ba', 'slg', 
-                                           'hard_hit_percent', 'whiff_percent', 'k_percent', 'pa']).to_dicts()
+            return widen_floats(batter_pitch_data.select(['pitch_type', 'ba', 'est_ba', 'slg', 
+                                           'hard_hit_percent', 'whiff_percent', 'k_percent', 'pa'])).to_dicts()
     
     return None
 
+@metrics.timed('webhook_send')
 def send_to_webhook(data, webhook_url):
-    """Send data to webhook"""
+    """Send data to webhook (a dict, or already-serialized JSON bytes)"""
     if not webhook_url:
         print("Warning: No webhook URL configured")
         return False
     
     try:
         print(f"Sending data to webhook: {webhook_url}")
-        response = requests.post(webhook_url, json=data, timeout=30)
+        if isinstance(data, bytes):
+            body, content_encoding = compress(data, WEBHOOK_COMPRESSION)
+            headers = {'Content-Type': 'application/json'}
+            if content_encoding:
+                headers['Content-Encoding'] = content_encoding
+            response = http_client.post(webhook_url, endpoint='webhook', data=body, timeout=(5, 30),
+                                        headers=headers)
+        else:
+            response = http_client.post(webhook_url, endpoint='webhook', json=data, timeout=(5, 30))
         response.raise_for_status()
+        metrics.incr('webhook_bytes_sent', len(response.request.body or b''))
         print(f"Successfully sent data to webhook. Status: {response.status_code}")
         return True
     except Exception as e:
         print(f"Error sending to webhook: {e}")
         return False
 
-if __name__ == "__main__":
-    print(f"Baseball Scraper running at {datetime.now()}")
-    
-    # Fetch matchups from API
-    api_data = fetch_matchups()
-    if not api_data:
-        print("No matchups found")
-        exit()
-    
-    print(f"Processing {len(api_data)} games...")
-    
-    # Load Statcast data for current season
-    print(f"Loading {SEASON_YEAR} MLB data from Baseball Savant...")
-    all_arsenals = statcast_pitch_arsenals_leaderboard(SEASON_YEAR)
-    print(f"Loaded {len(all_arsenals)} pitchers")
-    
-    # Use min_pa=1 to get all batters
-    all_batter_stats = statcast_pitch_arsenal_stats_leaderboard(SEASON_YEAR, min_pa=1)
-    print(f"Loaded {len(all_batter_stats)} batter records")
+def matchup_entry(batter_name, team, pitcher, weighted_result, stats, batter_baseline):
+    """One batter's entry in a game report's key_matchups"""
+    return {
+        'batter': batter_name,
+        'team': team,
+        'vs_pitcher': pitcher,
+        'weighted_avg_ba': round(weighted_result['weighted_ba'], 3),
+        'weighted_est_ba': round(weighted_result['weighted_est_ba'], 3),
+        'weighted_whiff': round(weighted_result['weighted_whiff'], 1),
+        'weighted_k_rate': round(weighted_result['weighted_k_rate'], 1),
+        'weighted_hard_hit': round(weighted_result['weighted_hard_hit'], 1),
+        'matchup_score': weighted_result['matchup_score'],
+        'arsenal_coverage': round(weighted_result['coverage'], 2),
+        'total_pa': weighted_result['total_pa'],
+        'reliability': weighted_result['reliability'],
+        'pitch_breakdown': weighted_result['pitch_performances'],
+        'pitch_stats': stats,
+        'baseline_stats': batter_baseline
+    }
 
-    # Load baseline stats from FanGraphs
-    batting_baselines, pitching_baselines = load_baseline_stats(SEASON_YEAR)
-    
-    # Process matchups
+def build_game_reports(api_data, all_arsenals, all_batter_stats, batting_baselines, pitching_baselines):
+    """Build one report per game, scoring every batter on the slate in a single engine pass"""
+    return list(iter_game_reports(api_data, all_arsenals, all_batter_stats,
+                                  batting_baselines, pitching_baselines))
+
+def iter_game_reports(api_data, all_arsenals, all_batter_stats, batting_baselines, pitching_baselines,
+                      score_pairs=iter_slate_scores):
+    """Yield each game's report as soon as its batters are scored, so output can be streamed.
+
+    score_pairs(pairs, all_arsenals, all_batter_stats) must yield one result per pair;
+    watch mode passes a memoized scorer.
+    """
     all_reports = []
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    pair_counts = []
+    pairs = []
+    pair_teams = []
     
+    # Watch mode passes only changed games, each tagged with its number in the full slate
+    numbers = game_numbers(api_data)
     for i, matchup in enumerate(api_data):
-        print(f"\nProcessing Game {i+1}: {matchup['away_team']} @ {matchup['home_team']}")
-        
         # Parse pitcher names
         away_pitcher = parse_pitcher_name(matchup['away_pitcher'])
         home_pitcher = parse_pitcher_name(matchup['home_pitcher'])
@@ -352,6 +403,7 @@ if __name__ == "__main__":
         game_report = {
             'game_date': datetime.now().strftime("%Y-%m-%d"),
             'matchup': f"{matchup['away_team']} @ {matchup['home_team']}",
+            'game_number': matchup.get('game_number', numbers[i]),
             'pitchers': {
                 'away': {
                     'name': away_pitcher,
@@ -370,131 +422,329 @@ if __name__ == "__main__":
             'batters_found': 0,
             'batters_missing': 0
         }
+        all_reports.append(game_report)
+        pair_counts.append(0)
         
-        # Process away team batters vs home pitcher
-        if home_arsenal:
-            for batter_string in matchup['away_lineup']:
-                batter_name = parse_batter_name(batter_string)
-                stats = get_batter_vs_pitches(batter_name, list(home_arsenal.keys()), all_batter_stats)
-                
-                if stats:
-                    # Calculate weighted metrics
-                    weighted_result = calculate_weighted_metrics(stats, home_arsenal)
-                    
-                    if weighted_result:
-                        # Get batter baseline
-                        batter_baseline = get_batter_baseline(batter_name, batting_baselines)
-
-                        game_report['key_matchups'].append({
-                            'batter': batter_name,
-                            'team': matchup['away_team'],
-                            'vs_pitcher': home_pitcher,
-                            'weighted_avg_ba': round(weighted_result['weighted_ba'], 3),
-                            'weighted_est_ba': round(weighted_result['weighted_est_ba'], 3),
-                            'weighted_whiff': round(weighted_result['weighted_whiff'], 1),
-                            'weighted_k_rate': round(weighted_result['weighted_k_rate'], 1),
-                            'weighted_hard_hit': round(weighted_result['weighted_hard_hit'], 1),
-                            'matchup_score': weighted_result['matchup_score'],
-                            'arsenal_coverage': round(weighted_result['coverage'], 2),
-                            'total_pa': weighted_result['total_pa'],
-                            'reliability': weighted_result['reliability'],
-                            'pitch_breakdown': weighted_result['pitch_performances'],
-                            'pitch_stats': stats,
-                            'baseline_stats': batter_baseline
-                        })
-                        game_report['batters_found'] += 1
-                    else:
-                        game_report['batters_missing'] += 1
-                else:
-                    game_report['batters_missing'] += 1
-        
-        # Process home team batters vs away pitcher
-        if away_arsenal:
-            for batter_string in matchup['home_lineup']:
+        # Away team batters vs home pitcher, then home team batters vs away pitcher
+        sides = [
+            (matchup['away_lineup'], matchup['away_team'], home_pitcher, home_arsenal),
+            (matchup['home_lineup'], matchup['home_team'], away_pitcher, away_arsenal),
+        ]
+        for lineup, team, pitcher, arsenal in sides:
+            if not arsenal:
+                continue
+            for batter_string in lineup:
                 batter_name = parse_batter_name(batter_string)
-                stats = get_batter_vs_pitches(batter_name, list(away_arsenal.keys()), all_batter_stats)
-                
-                if stats:
-                    # Calculate weighted metrics
-                    weighted_result = calculate_weighted_metrics(stats, away_arsenal)
-                    
-                    if weighted_result:
-                        # Get batter baseline
-                        batter_baseline = get_batter_baseline(batter_name, batting_baselines)
-
-                        game_report['key_matchups'].append({
-                            'batter': batter_name,
-                            'team': matchup['home_team'],
-                            'vs_pitcher': away_pitcher,
-                            'weighted_avg_ba': round(weighted_result['weighted_ba'], 3),
-                            'weighted_est_ba': round(weighted_result['weighted_est_ba'], 3),
-                            'weighted_whiff': round(weighted_result['weighted_whiff'], 1),
-                            'weighted_k_rate': round(weighted_result['weighted_k_rate'], 1),
-                            'weighted_hard_hit': round(weighted_result['weighted_hard_hit'], 1),
-                            'matchup_score': weighted_result['matchup_score'],
-                            'arsenal_coverage': round(weighted_result['coverage'], 2),
-                            'total_pa': weighted_result['total_pa'],
-                            'reliability': weighted_result['reliability'],
-                            'pitch_breakdown': weighted_result['pitch_performances'],
-                            'pitch_stats': stats,
-                            'baseline_stats': batter_baseline
-                        })
-                        game_report['batters_found'] += 1
-                    else:
-                        game_report['batters_missing'] += 1
-                else:
-                    game_report['batters_missing'] += 1
+                pairs.append((batter_name, pitcher))
+                pair_teams.append(team)
+                pair_counts[-1] += 1
+    
+    with metrics.span('score_slate'):
+        scored_pairs = zip(pairs, pair_teams, score_pairs(pairs, all_arsenals, all_batter_stats))
+    
+    for i, game_report in enumerate(all_reports):
+        game_start = time.perf_counter()
+        for _ in range(pair_counts[i]):
+            (batter_name, pitcher), team, scored = next(scored_pairs)
+            if scored is None:
+                game_report['batters_missing'] += 1
+                continue
+            
+            weighted_result, stats = scored
+            # Get batter baseline
+            batter_baseline = get_batter_baseline(batter_name, batting_baselines)
+
+            game_report['key_matchups'].append(
+                matchup_entry(batter_name, team, pitcher, weighted_result, stats, batter_baseline))
+            game_report['batters_found'] += 1
+        metrics.record('score_game', time.perf_counter() - game_start)
         
+        print(f"\nProcessing Game {i+1}: {game_report['matchup']}")
         print(f"  Found: {game_report['batters_found']}/18 batters")
-        all_reports.append(game_report)
-    
-    # Create final payload
-    final_data = {
+        # Hand the finished report off without keeping a reference to it
+        all_reports[i] = None
+        yield game_report
+
+def publish_payload(payload, batch_id):
+    """Hand serialized JSON to the webhook: queued in the durable outbox, or posted directly"""
+    if USE_OUTBOX:
+        return enqueue_payload(WEBHOOK_URL, payload, batch_id)
+    return send_to_webhook(payload, WEBHOOK_URL)
+
+def apply_shrinkage(all_batter_stats, batting_baselines, prior_seasons=0):
+    """Shrink the batter-by-pitch stats once, folding in warehoused earlier seasons when asked"""
+    prior_stats = None
+    if prior_seasons:
+        # warehouse imports this module, so it is imported only when used
+        from warehouse import load_seasons
+        try:
+            prior_stats = load_seasons('batter_stats', range(SEASON_YEAR - prior_seasons, SEASON_YEAR),
+                                       columns=BATTER_STAT_COLUMNS, predicate=BATTER_STAT_ROWS)
+        except FileNotFoundError as e:
+            print(f"   Warning: {e} - shrinking toward this season's priors only")
+    with metrics.span('shrinkage'):
+        shrunk = shrink_batter_stats(all_batter_stats, batting_baselines, prior_stats)
+    print(f"📉 Shrunk {len(shrunk)} batter/pitch-type rows toward league and FanGraphs baselines"
+          + (f" plus {len(prior_stats)} earlier-season rows" if prior_stats is not None else ""))
+    return shrunk
+
+def load_all_sources(refresh=False, include_matchups=True, compact_dtypes=False, shrink=None, prior_seasons=None):
+    """Fetch matchups, Savant leaderboards and FanGraphs baselines concurrently"""
+    refresh = refresh or None
+    shrink = SHRINKAGE if shrink is None else shrink
+    prior_seasons = SHRINKAGE_PRIOR_SEASONS if prior_seasons is None else prior_seasons
+    memory_report = []
+
+    def compacted(df, label):
+        # Compacted before any name index or long table is built for the frame
+        return compact_with_report(df, label, memory_report) if compact_dtypes else df
+
+    sources = {'matchups': (fetch_matchups, MATCHUPS_TIMEOUT, [])} if include_matchups else {}
+    sources.update({
+        # The long arsenal table is built as part of the load, off the scoring path
+        'arsenals': (lambda: prepare_arsenals(compacted(load_cached_leaderboard(
+            statcast_pitch_arsenals_leaderboard, SEASON_YEAR, refresh=refresh, columns=ARSENAL_COLUMNS),
+            'arsenals')),
+            SAVANT_TIMEOUT, None),
+        # Use min_pa=1 to get all batters
+        'batter_stats': (lambda: load_cached_leaderboard(
+            statcast_pitch_arsenal_stats_leaderboard, SEASON_YEAR, refresh=refresh,
+            columns=BATTER_STAT_COLUMNS, predicate=BATTER_STAT_ROWS, min_pa=1),
+            SAVANT_TIMEOUT, None),
+        'baselines': (lambda: tuple(compacted(df, label) for df, label in zip(
+            load_baseline_stats(SEASON_YEAR, refresh=refresh), ('batting_baselines', 'pitching_baselines'))),
+                      FANGRAPHS_TIMEOUT, (None, None)),
+    })
+    results, timings = load_concurrently(sources)
+    print_timing_report(timings)
+    # Every later player lookup (and the shrinkage join) goes through the MLBAM id crosswalk
+    if results['arsenals'] is not None and results['batter_stats'] is not None:
+        try:
+            batting_baselines, pitching_baselines = results['baselines']
+            refresh_crosswalk([('batter', results['batter_stats'], batting_baselines),
+                               ('pitcher', results['arsenals'], pitching_baselines)])
+        except Exception as e:
+            print(f"   Warning: Could not build the player crosswalk ({e}) - resolving players by name")
+            activate_crosswalk(None)
+    # Shrinkage needs the FanGraphs baselines, so it runs once everything has arrived
+    if shrink and results['batter_stats'] is not None:
+        results['batter_stats'] = apply_shrinkage(results['batter_stats'], results['baselines'][0], prior_seasons)
+    results['batter_stats'] = compacted(results['batter_stats'], 'batter_stats')
+    print_memory_report(sorted(memory_report))
+    return results
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="MLB pitch-type matchup scraper")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Ignore cached leaderboards and re-download them")
+    parser.add_argument('--compact', action='store_true',
+                        default=os.getenv('OUTPUT_COMPACT', '') in ('1', 'true', 'yes'),
+                        help="Write compact (unindented) JSON output")
+    parser.add_argument('--publish', choices=['full', 'delta'],
+                        default=os.getenv('PUBLISH_MODE', 'full'),
+                        help="Send the full slate, or only matchups changed since the last publish")
+    parser.add_argument('--shrink', action='store_true', default=SHRINKAGE,
+                        help="Regress small-sample pitch-type stats toward league and FanGraphs baselines")
+    parser.add_argument('--prior-seasons', type=int, default=SHRINKAGE_PRIOR_SEASONS,
+                        help="With --shrink, also fold this many earlier warehoused seasons into the prior")
+    parser.add_argument('--compact-dtypes', action='store_true',
+                        default=os.getenv('COMPACT_DTYPES', '') in ('1', 'true', 'yes'),
+                        help="Hold leaderboards as Categorical/Float32/small-int columns (report values unchanged)")
+    parser.add_argument('--profile', choices=sorted(profiler.BACKENDS),
+                        help="Profile with cProfile or the sampling profiler, written to profiles/<timestamp>_<pid>/")
+    parser.add_argument('--profile-scope', choices=['loop', 'run'], default='loop',
+                        help="Profile only the per-game scoring loop (default) or the whole run")
+    parser.add_argument('--import-profile', action='store_true',
+                        help="Re-run under -X importtime and report where import time goes")
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument('--record', metavar='DIR',
+                         help="Record every HTTP call and leaderboard to an archive directory")
+    archive.add_argument('--replay', metavar='DIR',
+                         help="Replay a recorded archive without touching the network")
+    return parser.parse_args()
+
+def profile_annotations(api_data, all_arsenals, all_batter_stats, batting_baselines, pitching_baselines):
+    """Slate and data sizes recorded alongside a profile"""
+    return {
+        'games': len(api_data),
+        'lineup_batters': sum(len(m['away_lineup']) + len(m['home_lineup']) for m in api_data),
+        'arsenal_rows': len(all_arsenals),
+        'batter_stat_rows': len(all_batter_stats),
+        'batting_baseline_rows': len(batting_baselines) if batting_baselines is not None else 0,
+        'pitching_baseline_rows': len(pitching_baselines) if pitching_baselines is not None else 0,
+    }
+
+def run_pipeline(api_data, all_arsenals, all_batter_stats, batting_baselines, pitching_baselines,
+                 publish='full', compact=False):
+    """Score the slate, stream it to disk and hand it to the webhook; returns a run summary"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = f"mlb_matchups_{timestamp}.json"
+    header = {
         'timestamp': timestamp,
-        'date': datetime.now().strftime("%Y-%m-%d"),
-        'games_processed': len(all_reports),
-        'reports': all_reports
+        'date': datetime.now().strftime("%Y-%m-%d")
     }
     
-    # Save locally for backup
-    output_filename = f"mlb_matchups_{timestamp}.json"
-    with open(output_filename, "w") as f:
-        json.dump(final_data, f, indent=2)
+    # Score the whole slate in one pass and stream each game's report to disk as it's built
+    total_found = 0
+    example_matchups = []
+    # With chunked delivery, chunks go out to the webhook while later games are still being scored
+    webhook_sink = None
+    queued = False
+    batch_id = new_batch_id()
+    if WEBHOOK_URL and WEBHOOK_CHUNKING != 'none' and publish == 'full':
+        deliver = outbox_deliverer(WEBHOOK_URL, batch_id) if USE_OUTBOX else None
+        webhook_sink = ChunkedWebhookSink(WEBHOOK_URL, header, deliver=deliver, batch_id=batch_id)
+    
+    # In delta mode each game is diffed against the last published snapshot as it's written
+    delta_sink = DeltaSink(header, load_snapshot()) if publish == 'delta' else None
+    
+    sinks = [sink for sink in (webhook_sink, delta_sink) if sink]
+    slate_sizes = profile_annotations(api_data, all_arsenals, all_batter_stats,
+                                      batting_baselines, pitching_baselines)
+    with profiler.section('loop', **slate_sizes), \
+            StreamingReportWriter(output_filename, header, compact=compact, sinks=sinks) as writer:
+        for report in iter_game_reports(api_data, all_arsenals, all_batter_stats,
+                                        batting_baselines, pitching_baselines):
+            writer.write_report(report)
+            total_found += report['batters_found']
+            if len(example_matchups) < 3:
+                example_matchups.extend(report['key_matchups'][:3 - len(example_matchups)])
+    games_processed = writer.count
     
     print(f"\n{'='*60}")
-    print(f"Scraping complete! Processed {len(all_reports)} games")
+    print(f"Scraping complete! Processed {games_processed} games")
+    print(f"Saved {writer.bytes_written / 1024:.0f} KB to {output_filename}")
     
     # Send to webhook if configured
-    if WEBHOOK_URL:
-        success = send_to_webhook(final_data, WEBHOOK_URL)
-        if success:
+    if delta_sink:
+        delta, snapshot = delta_sink.finish()
+        print(f"Changes since last publish: {delta['changes']}")
+        if not delta_sink.has_changes():
+            print("No changes since last publish - nothing to send")
+        elif WEBHOOK_URL:
+            payload = serialize_delta(delta)
+            published = publish_payload(payload, batch_id)
+            queued = published and USE_OUTBOX
+            # Only a delta that was handed off becomes the new base for the next diff
+            if published:
+                print(f"Published delta {batch_id} ({len(payload) / 1024:.0f} KB)")
+                save_snapshot(snapshot)
+        else:
+            print("No webhook URL configured - delta not published")
+    elif webhook_sink:
+        delivery = webhook_sink.finish()
+        if delivery['sent_bytes'] is None:
+            queued = True
+            print(f"Queued {delivery['chunks']} chunks in batch {delivery['batch_id']} "
+                  f"({delivery['raw_bytes'] / 1024:.0f} KB)")
+        else:
+            print(f"Sent {delivery['chunks']} chunks in batch {delivery['batch_id']} "
+                  f"({delivery['raw_bytes'] / 1024:.0f} KB, {delivery['sent_bytes'] / 1024:.0f} KB on the wire)")
+            if delivery['failed_chunks']:
+                print(f"Error: chunks {delivery['failed_chunks']} could not be delivered")
+            else:
+                print("Data successfully sent to webhook!")
+    elif WEBHOOK_URL:
+        with open(output_filename, 'rb') as f:
+            payload = f.read()
+        published = publish_payload(payload, batch_id)
+        queued = published and USE_OUTBOX
+        if published and not USE_OUTBOX:
             print("Data successfully sent to webhook!")
     else:
         print("No webhook URL configured - data only saved locally")
     
-    print(f"{'='*60}")
-    
-    # Print summary
-    total_found = sum(r['batters_found'] for r in all_reports)
-    total_possible = len(all_reports) * 18
-    print(f"\nOverall Coverage: {total_found}/{total_possible} batters ({(total_found/total_possible)*100:.1f}%)")
+    return {
+        'output_filename': output_filename,
+        'games_processed': games_processed,
+        'total_found': total_found,
+        'example_matchups': example_matchups,
+        'queued': queued,
+    }
+
+def print_summary(summary):
+    """Print slate coverage and a few example matchups"""
+    total_possible = summary['games_processed'] * 18
+    print(f"\nOverall Coverage: {summary['total_found']}/{total_possible} batters ({(summary['total_found']/total_possible)*100:.1f}%)")
     
     # Show examples with baseline comparisons
-    if all_reports:
-        all_matchups = []
-        for report in all_reports:
-            all_matchups.extend(report['key_matchups'])
-        
-        if all_matchups:
-            print("\n=== EXAMPLE MATCHUPS WITH BASELINE COMPARISONS ===")
-            for m in all_matchups[:3]:
-                print(f"{m['batter']} vs {m['vs_pitcher']}")
-                print(f"  Weighted BA: {m['weighted_avg_ba']:.3f}, K-rate: {m['weighted_k_rate']:.1f}%")
-                if m.get('baseline_stats'):
-                    baseline = m['baseline_stats']
-                    ba_diff = m['weighted_avg_ba'] - baseline['season_avg']
-                    k_diff = m['weighted_k_rate'] - baseline['season_k_pct']
-                    print(f"  Season BA: {baseline['season_avg']:.3f} (vs pitcher: {ba_diff:+.3f})")
-                    print(f"  Season K%: {baseline['season_k_pct']:.1f}% (vs pitcher: {k_diff:+.1f}%)")
-                    print(f"  Season OPS: {baseline['season_ops']:.3f}")
-                print()
+    if summary['example_matchups']:
+        print("\n=== EXAMPLE MATCHUPS WITH BASELINE COMPARISONS ===")
+        for m in summary['example_matchups']:
+            print(f"{m['batter']} vs {m['vs_pitcher']}")
+            print(f"  Weighted BA: {m['weighted_avg_ba']:.3f}, K-rate: {m['weighted_k_rate']:.1f}%")
+            if m.get('baseline_stats'):
+                baseline = m['baseline_stats']
+                ba_diff = m['weighted_avg_ba'] - baseline['season_avg']
+                k_diff = m['weighted_k_rate'] - baseline['season_k_pct']
+                print(f"  Season BA: {baseline['season_avg']:.3f} (vs pitcher: {ba_diff:+.3f})")
+                print(f"  Season K%: {baseline['season_k_pct']:.1f}% (vs pitcher: {k_diff:+.1f}%)")
+                print(f"  Season OPS: {baseline['season_ops']:.3f}")
+            print()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.import_profile:
+        from import_profile import run_with_import_profile
+        exit(run_with_import_profile(__file__, [arg for arg in sys.argv[1:] if arg != '--import-profile']))
+    if args.record:
+        http_archive.enable('record', args.record)
+    elif args.replay:
+        http_archive.enable('replay', args.replay)
+    else:
+        http_archive.configure_from_env()
+    print(f"Baseball Scraper running at {datetime.now()}")
+    if args.profile:
+        profiler.configure(args.profile, args.profile_scope)
+        profiler.start('run')
+    
+    # Start delivering anything earlier runs left in the outbox while we load
+    if WEBHOOK_URL and USE_OUTBOX:
+        outbox.start_worker()
+    
+    # Load every upstream source at once - latency is bounded by the slowest one
+    print(f"Loading matchups and {SEASON_YEAR} MLB data (Savant + FanGraphs)...")
+    sources = load_all_sources(refresh=args.refresh, compact_dtypes=args.compact_dtypes,
+                               shrink=args.shrink, prior_seasons=args.prior_seasons)
+
+    api_data = sources['matchups']
+    if not api_data:
+        print("No matchups found")
+        exit()
+
+    all_arsenals = sources['arsenals']
+    all_batter_stats = sources['batter_stats']
+    if all_arsenals is None or all_batter_stats is None:
+        print("Could not load Savant leaderboards")
+        exit(1)
+
+    print(f"Processing {len(api_data)} games...")
+    print(f"Loaded {len(all_arsenals)} pitchers")
+    print(f"Loaded {len(all_batter_stats)} batter records")
+
+    # Baseline stats from FanGraphs
+    batting_baselines, pitching_baselines = sources['baselines']
+    
+    summary = run_pipeline(api_data, all_arsenals, all_batter_stats, batting_baselines, pitching_baselines,
+                           publish=args.publish, compact=args.compact)
+    
+    if WEBHOOK_URL and USE_OUTBOX:
+        remaining = outbox.stop_worker(OUTBOX_FLUSH_SECONDS)
+        if remaining:
+            print(f"{remaining} payloads still queued - they are retried on the next run or by `python outbox.py`")
+        elif summary['queued']:
+            print("Data successfully sent to webhook!")
+    
+    http_client.print_latency_report()
+    metrics.print_stage_report()
+    metrics.write_run_summary({
+        'games_processed': summary['games_processed'],
+        'batters_found': summary['total_found'],
+        'output_filename': summary['output_filename'],
+        'http': http_client.latency_stats(),
+    })
+    profiler.stop('run')
+    print(f"{'='*60}")
+    
+    print_summary(summary)
@@ -0,0 +1,133 @@
+import os
+
+import polars as pl
+
+from compact_dtypes import widen_series
+from crosswalk import frame_ids
+from name_index import split_name
+
+# PA at which a batter's own pitch-type sample and the prior get equal weight
+SHRINKAGE_PA = float(os.getenv('SHRINKAGE_PA', '60'))
+
+# Earlier seasons' PA count this much toward the prior (0.5: two old PA are worth one current PA)
+PRIOR_SEASON_WEIGHT = float(os.getenv('PRIOR_SEASON_WEIGHT', '0.5'))
+
+SHRUNK_COLUMNS = ['ba', 'est_ba', 'slg', 'hard_hit_percent', 'whiff_percent', 'k_percent']
+
+# Metrics with a FanGraphs season counterpart: (baseline column, scale to the Savant units)
+BASELINE_COLUMNS = {'ba': ('AVG', 1.0), 'est_ba': ('AVG', 1.0), 'k_percent': ('K%', 100.0)}
+
+NAME_COLUMN = 'last_name, first_name'
+
+def name_keys(names):
+    """Normalized 'last|first' key per name, matching the name index (one split per distinct name)"""
+    names = names.cast(pl.String)
+    distinct = names.drop_nulls().unique().to_list()
+    keys = {name: '|'.join(split_name(name)) for name in distinct}
+    return names.replace_strict(keys, default=None, return_dtype=pl.String)
+
+def savant_keys(df, by_id):
+    """Join key per row of a Savant frame: its MLBAM id, or the normalized name"""
+    return df['player_id'].cast(pl.Int64) if by_id else name_keys(df[NAME_COLUMN])
+
+def pa_weighted_mean(column, pa='_pa'):
+    """PA-weighted mean of a column over the rows that have it (plain mean if they have no PA)"""
+    value = pl.col(column)
+    weight = pl.col(pa).filter(value.is_not_null()).sum()
+    return pl.when(weight > 0).then((value * pl.col(pa)).sum() / weight).otherwise(value.mean())
+
+def baseline_offsets(batting_baselines, keys):
+    """Each batter's FanGraphs AVG/K% minus the PA-weighted league value, in Savant units.
+
+    `keys` maps FanGraphs rows to join keys (columns row, _key); a row may
+    carry several keys.
+    """
+    available = {metric: spec for metric, spec in BASELINE_COLUMNS.items()
+                 if spec[0] in batting_baselines.columns}
+    pa = batting_baselines['PA'].cast(pl.Float64) if 'PA' in batting_baselines.columns \
+        else pl.Series([1.0] * len(batting_baselines))
+    frame = pl.DataFrame({'row': pl.int_range(len(batting_baselines), eager=True, dtype=pl.UInt32)})
+    for metric, (column, scale) in available.items():
+        values = widen_series(batting_baselines[column]).cast(pl.Float64) * scale
+        weight = pa.filter(values.is_not_null()).sum()
+        league = (values * pa).sum() / weight if weight > 0 else values.mean()
+        frame = frame.with_columns((values - league).alias(f'_offset_{metric}'))
+    frame = keys.join(frame, on='row', how='inner', maintain_order='left').drop('row')
+    # A player on two FanGraphs rows keeps the first, as the baseline lookup does
+    return frame.drop_nulls('_key').unique('_key', keep='first', maintain_order=True), list(available)
+
+def prior_season_samples(prior_stats, columns, by_id):
+    """Earlier seasons collapsed to one row per (batter, pitch type): discounted PA and PA-weighted means"""
+    prior = prior_stats.select(
+        savant_keys(prior_stats, by_id).alias('_key'),
+        pl.col('pitch_type').cast(pl.String).alias('_pitch'),
+        pl.col('pa').cast(pl.Float64).fill_null(0.0).alias('_pa'),
+        *[widen_series(prior_stats[column]).cast(pl.Float64) for column in columns if column in prior_stats.columns],
+    )
+    aggregations = []
+    for column in columns:
+        if column not in prior.columns:
+            continue
+        aggregations.append((pl.col('_pa').filter(pl.col(column).is_not_null()).sum() * PRIOR_SEASON_WEIGHT)
+                            .alias(f'_prior_pa_{column}'))
+        aggregations.append(pa_weighted_mean(column).alias(f'_prior_{column}'))
+    return prior.group_by(['_key', '_pitch']).agg(aggregations)
+
+def shrink_batter_stats(all_batter_stats, batting_baselines=None, prior_stats=None, shrink_pa=None):
+    """Regress every batter x pitch-type metric toward a prior, weighted by PA, in one columnar pass.
+
+    The prior is the league PA-weighted mean for the pitch type, shifted by
+    how far the batter's FanGraphs season line sits from league average
+    (BA, xBA, K%). With `prior_stats` (earlier seasons' arsenal stats) the
+    batter's own history for that pitch is folded into the prior first.
+
+    shrunk = (pa * raw + shrink_pa * prior) / (pa + shrink_pa). The shrunk
+    values replace the metric columns, so scoring reads them unchanged; the
+    originals are kept as raw_<metric>. Missing metrics stay missing.
+    """
+    shrink_pa = SHRINKAGE_PA if shrink_pa is None else shrink_pa
+    # Batters are matched to FanGraphs by MLBAM id when the crosswalk covers the baselines
+    baseline_ids = frame_ids(batting_baselines) if batting_baselines is not None else None
+    by_id = baseline_ids is not None and all(
+        'player_id' in df.columns for df in (all_batter_stats, prior_stats) if df is not None)
+    columns = [column for column in SHRUNK_COLUMNS if column in all_batter_stats.columns]
+    stats = all_batter_stats.with_columns(
+        savant_keys(all_batter_stats, by_id).alias('_key'),
+        pl.col('pitch_type').cast(pl.String).alias('_pitch'),
+        pl.col('pa').cast(pl.Float64).fill_null(0.0).alias('_pa'),
+        *[widen_series(all_batter_stats[column]).cast(pl.Float64).alias(f'raw_{column}') for column in columns],
+    )
+    stats = stats.join(
+        stats.group_by('_pitch').agg(pa_weighted_mean(f'raw_{column}').alias(f'_league_{column}')
+                                     for column in columns),
+        on='_pitch', how='left', maintain_order='left')
+
+    offset_metrics = []
+    if batting_baselines is not None and 'Name' in batting_baselines.columns:
+        if by_id:
+            keys = baseline_ids.rename({'mlbam_id': '_key'})
+        else:
+            keys = pl.DataFrame({'row': pl.int_range(len(batting_baselines), eager=True, dtype=pl.UInt32),
+                                 '_key': name_keys(batting_baselines['Name'])})
+        offsets, offset_metrics = baseline_offsets(batting_baselines, keys)
+        stats = stats.join(offsets, on='_key', how='left', maintain_order='left')
+    if prior_stats is not None:
+        prior = prior_season_samples(prior_stats, columns, by_id)
+        stats = stats.join(prior, on=['_key', '_pitch'], how='left', maintain_order='left')
+
+    priors = {}
+    for column in columns:
+        prior = pl.col(f'_league_{column}')
+        if column in offset_metrics:
+            prior = prior + pl.col(f'_offset_{column}').fill_null(0.0)
+        if prior_stats is not None and f'_prior_{column}' in stats.columns:
+            prior_pa = pl.col(f'_prior_pa_{column}').fill_null(0.0)
+            prior = ((prior_pa * pl.col(f'_prior_{column}').fill_null(0.0) + shrink_pa * prior)
+                     / (prior_pa + shrink_pa))
+        priors[column] = prior
+    stats = stats.with_columns(
+        ((pl.col('_pa') * pl.col(f'raw_{column}') + shrink_pa * priors[column]) / (pl.col('_pa') + shrink_pa))
+        .alias(column)
+        for column in columns
+    )
+    return stats.select([name for name in stats.columns if not name.startswith('_')])
@@ -0,0 +1,183 @@
+import numpy as np
+import polars as pl
+
+import metrics
+from arsenal_table import get_arsenal_long
+from compact_dtypes import widen_floats
+from crosswalk import player_rows
+
+NAME_COLUMN = 'last_name, first_name'
+
+STAT_COLUMNS = ['pitch_type', 'ba', 'est_ba', 'slg',
+                'hard_hit_percent', 'whiff_percent', 'k_percent', 'pa']
+
+# Metrics folded into the weighted averages, in the order calculate_weighted_metrics adds them
+WEIGHTED_COLUMNS = ['ba', 'est_ba', 'whiff_percent', 'k_percent', 'hard_hit_percent']
+
+def matchup_scores(weighted_ba, weighted_whiff, weighted_k_rate, weighted_hard_hit):
+    """Vectorized calculate_matchup_score over arrays (unrounded composite)"""
+    whiff = weighted_whiff / 100
+    k_rate = weighted_k_rate / 100
+    hard_hit = weighted_hard_hit / 100
+
+    ba_score = np.maximum(0, np.minimum(100, (weighted_ba - 0.200) / 0.150 * 100))
+    whiff_score = np.maximum(0, np.minimum(100, (0.40 - whiff) / 0.30 * 100))
+    k_score = np.maximum(0, np.minimum(100, (0.35 - k_rate) / 0.25 * 100))
+    hard_hit_score = np.maximum(0, np.minimum(100, (hard_hit - 0.25) / 0.25 * 100))
+
+    return (
+        ba_score * 0.35 +
+        whiff_score * 0.25 +
+        k_score * 0.25 +
+        hard_hit_score * 0.15
+    )
+
+def sequential_group_sums(group_ids, position, values, n_groups):
+    """Per-group sums added strictly in row order, so results match a Python += loop bit for bit.
+
+    Loops over the position within each group (at most one per pitch type),
+    never over groups.
+    """
+    sums = np.zeros(n_groups, dtype=values.dtype)
+    for k in range(int(position.max()) + 1 if len(position) else 0):
+        at_k = position == k
+        sums[group_ids[at_k]] += values[at_k]
+    return sums
+
+def build_pair_rows(pairs, all_arsenals, all_batter_stats):
+    """Resolve (batter, pitcher) pairs into the long frame of batter-stat rows vs the pitcher's arsenal"""
+    # Name resolution is one lookup per distinct player (MLBAM ids through the crosswalk when loaded)
+    batter_ids = {}
+    batter_rows = {'batter_id': [], 'stat_row': []}
+    pitcher_rows = {}
+    pair_batter = []
+    pair_pitcher = []
+    for batter_name, pitcher_name in pairs:
+        if batter_name not in batter_ids:
+            batter_id = batter_ids[batter_name] = len(batter_ids)
+            with metrics.span('batter_stats_lookup'):
+                offsets = player_rows(all_batter_stats, NAME_COLUMN, batter_name)
+            if not offsets:
+                metrics.incr('batter_stats_misses')
+            batter_rows['batter_id'].extend([batter_id] * len(offsets))
+            batter_rows['stat_row'].extend(offsets)
+        if pitcher_name not in pitcher_rows:
+            offsets = player_rows(all_arsenals, NAME_COLUMN, pitcher_name)
+            if not offsets:
+                metrics.incr('pitcher_arsenal_misses')
+            pitcher_rows[pitcher_name] = offsets[0] if offsets else None
+        pair_batter.append(batter_ids[batter_name])
+        pair_pitcher.append(pitcher_rows[pitcher_name])
+
+    pair_frame = pl.DataFrame({
+        'pair_id': pl.int_range(len(pairs), eager=True, dtype=pl.UInt32),
+        'batter_id': pl.Series(pair_batter, dtype=pl.UInt32),
+        'pitcher_row': pl.Series(pair_pitcher, dtype=pl.UInt32),
+    })
+    batter_frame = pl.DataFrame({
+        'batter_id': pl.Series(batter_rows['batter_id'], dtype=pl.UInt32),
+        'stat_row': pl.Series(batter_rows['stat_row'], dtype=pl.UInt32),
+    })
+    stats = all_batter_stats.select(STAT_COLUMNS).with_row_index('stat_row')
+    arsenal_long = get_arsenal_long(all_arsenals).select(
+        ['pitcher_row', 'pitch_type', 'pitch_name', 'usage_rate'])
+    if stats.schema['pitch_type'] != arsenal_long.schema['pitch_type']:
+        # Compacted batter stats hold pitch_type as an Enum; types it doesn't list can't match anyway
+        arsenal_long = arsenal_long.with_columns(
+            pl.col('pitch_type').cast(stats.schema['pitch_type'], strict=False))
+
+    return widen_floats(
+        pair_frame
+        .join(batter_frame, on='batter_id', how='inner')
+        .join(stats, on='stat_row', how='inner')
+        .join(arsenal_long, on=['pitcher_row', 'pitch_type'], how='inner')
+        .sort(['pair_id', 'stat_row'])
+    )
+
+def score_slate(pairs, all_arsenals, all_batter_stats):
+    """Score a whole slate of (batter_name, pitcher_name) pairs in one columnar pass.
+
+    Returns a list aligned with `pairs`: (weighted_result, pitch_stats) with the
+    same values calculate_weighted_metrics and get_batter_vs_pitches produce,
+    or None when the batter has no stats against the pitcher's arsenal.
+    """
+    return list(iter_slate_scores(pairs, all_arsenals, all_batter_stats))
+
+def iter_slate_scores(pairs, all_arsenals, all_batter_stats):
+    """Like score_slate, but yields each pair's result lazily so callers can stream reports"""
+    n_pairs = len(pairs)
+    if n_pairs == 0:
+        return iter(())
+
+    rows = build_pair_rows(pairs, all_arsenals, all_batter_stats)
+    pair_ids = rows['pair_id'].to_numpy().astype(np.int64)
+    position = rows.select(pl.int_range(pl.len()).over('pair_id')).to_series().to_numpy()
+    usage_rate = rows['usage_rate'].to_numpy()
+
+    weighted = {}
+    for column in WEIGHTED_COLUMNS:
+        values = rows[column].cast(pl.Float64).fill_null(0.0).to_numpy()
+        weighted[column] = sequential_group_sums(pair_ids, position, values * usage_rate, n_pairs)
+    total_weight = sequential_group_sums(pair_ids, position, usage_rate, n_pairs)
+    total_pa = sequential_group_sums(pair_ids, position,
+                                     rows['pa'].fill_null(0).to_numpy().astype(np.int64), n_pairs)
+    counts = np.bincount(pair_ids, minlength=n_pairs)
+
+    scored = total_weight > 0
+    safe_weight = np.where(scored, total_weight, 1.0)
+    averages = {column: weighted[column] / safe_weight for column in WEIGHTED_COLUMNS}
+    composite = matchup_scores(averages['ba'], averages['whiff_percent'],
+                               averages['k_percent'], averages['hard_hit_percent'])
+
+    return materialize_results(rows, counts, scored, averages, total_weight, total_pa, composite)
+
+def materialize_results(rows, counts, scored, averages, total_weight, total_pa, composite):
+    """Turn the columnar results back into the per-batter dicts the reports use, one pair at a time"""
+    stat_columns = rows.select(STAT_COLUMNS).to_dict(as_series=False)
+    pitch_names = rows['pitch_name'].to_list()
+    usage_rates = rows['usage_rate'].to_list()
+    columns = {column: averages[column].tolist() for column in WEIGHTED_COLUMNS}
+    coverage = total_weight.tolist()
+    pa_totals = total_pa.tolist()
+    composite = composite.tolist()
+
+    start = 0
+    for pair_id, count in enumerate(counts.tolist()):
+        if count == 0 or not scored[pair_id]:
+            yield None
+            start += count
+            continue
+
+        stats = [dict(zip(STAT_COLUMNS, values)) for values in
+                 zip(*(stat_columns[column][start:start + count] for column in STAT_COLUMNS))]
+        pitch_performances = []
+        for stat, pitch_name, usage_rate in zip(stats, pitch_names[start:start + count],
+                                                 usage_rates[start:start + count]):
+            ba = stat['ba'] if stat['ba'] is not None else 0
+            pitch_performances.append({
+                'pitch_type': stat['pitch_type'],
+                'pitch_name': pitch_name,
+                'ba': ba,
+                'est_ba': stat['est_ba'] if stat['est_ba'] is not None else 0,
+                'whiff_percent': stat['whiff_percent'] if stat['whiff_percent'] is not None else 0,
+                'k_percent': stat['k_percent'] if stat['k_percent'] is not None else 0,
+                'hard_hit_percent': stat['hard_hit_percent'] if stat['hard_hit_percent'] is not None else 0,
+                'usage_rate': usage_rate,
+                'weighted_contribution': ba * usage_rate,
+                'pa': stat['pa']
+            })
+        start += count
+
+        result = {
+            'weighted_ba': columns['ba'][pair_id],
+            'weighted_est_ba': columns['est_ba'][pair_id],
+            'weighted_whiff': columns['whiff_percent'][pair_id],
+            'weighted_k_rate': columns['k_percent'][pair_id],
+            'weighted_hard_hit': columns['hard_hit_percent'][pair_id],
+            'pitch_performances': pitch_performances,
+            'coverage': coverage[pair_id],
+            'total_pa': pa_totals[pair_id],
+            'reliability': 'HIGH' if pa_totals[pair_id] >= 50 else 'MEDIUM' if pa_totals[pair_id] >= 20 else 'LOW',
+            'matchup_score': round(composite[pair_id], 1)
+        }
+        yield result, stats
@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+import polars as pl
+
+from crosswalk import activate_crosswalk, frame_ids, player_rows, refresh_crosswalk
+
+# Two players named Will Smith: the catcher (MLBAM 10, FanGraphs 101) and the pitcher (MLBAM 11, FanGraphs 201)
+BATTING = pl.DataFrame({'Name': ['Will Smith', 'Mookie Betts'], 'playerid': [101, 102], 'AVG': [.260, .290]})
+PITCHING = pl.DataFrame({'Name': ['Will Smith', 'Gerrit Cole'], 'playerid': [201, 202], 'ERA': [3.10, 2.95]})
+ARSENALS = pl.DataFrame({'last_name, first_name': ['Smith, Will', 'Cole, Gerrit'], 'pitcher': [11, 12]})
+
+def batter_stats(with_catcher):
+    names = ['Betts, Mookie'] + (['Smith, Will'] if with_catcher else [])
+    return pl.DataFrame({'last_name, first_name': names, 'player_id': [2, 10][:len(names)]})
+
+def build(path, with_catcher):
+    stats = batter_stats(with_catcher)
+    sources = [('batter', stats, BATTING), ('pitcher', ARSENALS, PITCHING)]
+    return refresh_crosswalk(sources, path=path), stats
+
+def mapped_ids(df):
+    return {row: mlbam_id for row, mlbam_id in frame_ids(df).iter_rows()}
+
+def test_shared_name_stays_with_its_role_across_builds():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'crosswalk.parquet')
+        # Day 1: Savant has no batter rows for the catcher, so his FanGraphs row must stay unlinked
+        day1, _ = build(path, with_catcher=False)
+        assert day1.filter(pl.col('fangraphs_id') == 101).is_empty()
+        assert mapped_ids(PITCHING) == {0: 11, 1: 12}
+        assert 0 not in mapped_ids(BATTING)
+
+        # Day 2 starts from the saved crosswalk; the catcher shows up and links to his own id
+        day2, stats = build(path, with_catcher=True)
+        pairs = set(day2.drop_nulls('fangraphs_id').select('mlbam_id', 'fangraphs_id').iter_rows())
+        assert pairs == {(10, 101), (2, 102), (11, 201), (12, 202)}
+        assert mapped_ids(BATTING) == {0: 10, 1: 2}
+        assert mapped_ids(PITCHING) == {0: 11, 1: 12}
+
+        # Each frame resolves the shared name to its own player
+        assert player_rows(stats, 'last_name, first_name', 'Smith, Will') == [1]
+        assert player_rows(ARSENALS, 'last_name, first_name', 'Smith, Will') == [0]
+        assert player_rows(BATTING, 'Name', 'Will Smith') == [0]
+        assert player_rows(PITCHING, 'Name', 'Will Smith') == [0]
+    activate_crosswalk(None)
+
+def test_unmatched_spelling_falls_back_to_the_frames_own_lookup():
+    with tempfile.TemporaryDirectory() as tmp:
+        _, stats = build(os.path.join(tmp, 'crosswalk.parquet'), with_catcher=True)
+        # 'Smith, Willson' has no exact crosswalk match; the surname must not resolve to another Smith's id
+        assert player_rows(stats, 'last_name, first_name', 'Smith, Willson') == [1]
+        assert player_rows(stats, 'last_name, first_name', 'Betts, Markus') == [0]
+    activate_crosswalk(None)
+
+if __name__ == "__main__":
+    test_shared_name_stays_with_its_role_across_builds()
+    test_unmatched_spelling_falls_back_to_the_frames_own_lookup()
+    print("crosswalk tests passed")
@@ -0,0 +1,123 @@
+import os
+import argparse
+
+import polars as pl
+
+import metrics
+from leaderboard_cache import load_cached_leaderboard, prune, write_cache
+from scraper import (
+    SEASON_YEAR, fangraphs_batting_season, fangraphs_pitching_season,
+    statcast_pitch_arsenal_stats_leaderboard, statcast_pitch_arsenals_leaderboard,
+)
+
+# Season-partitioned Parquet (hive layout): WAREHOUSE_DIR/<dataset>/season=<year>/data.parquet
+WAREHOUSE_DIR = os.getenv('WAREHOUSE_DIR', 'warehouse')
+
+# Leaderboard function and params behind each dataset (same params as the daily run)
+DATASETS = {
+    'arsenals': (statcast_pitch_arsenals_leaderboard, {}),
+    'batter_stats': (statcast_pitch_arsenal_stats_leaderboard, {'min_pa': 1}),
+    'batting_baselines': (fangraphs_batting_season, {'min_pa': 50}),
+    'pitching_baselines': (fangraphs_pitching_season, {'min_ip': 10}),
+}
+
+def partition_path(dataset, season, warehouse_dir=None):
+    """Parquet file holding one season of a dataset"""
+    return os.path.join(warehouse_dir or WAREHOUSE_DIR, dataset, f"season={season}", 'data.parquet')
+
+def stored_seasons(dataset, warehouse_dir=None):
+    """Seasons with a partition on disk, oldest first"""
+    root = os.path.join(warehouse_dir or WAREHOUSE_DIR, dataset)
+    if not os.path.isdir(root):
+        return []
+    seasons = []
+    for entry in os.listdir(root):
+        if entry.startswith('season=') and entry[len('season='):].isdigit():
+            season = int(entry[len('season='):])
+            if os.path.exists(partition_path(dataset, season, warehouse_dir)):
+                seasons.append(season)
+    return sorted(seasons)
+
+def sync_season(dataset, season, refresh=False, warehouse_dir=None):
+    """Write one season's partition; returns True if it was (re)written.
+
+    Finished seasons never change, so they are downloaded once. The current
+    season is rewritten on every sync, through the leaderboard cache's TTL.
+    """
+    path = partition_path(dataset, season, warehouse_dir)
+    if os.path.exists(path) and season < SEASON_YEAR and not refresh:
+        return False
+    func, params = DATASETS[dataset]
+    # The season lives in the directory name, not in the file
+    write_cache(load_cached_leaderboard(func, season, refresh=refresh or None, **params), path)
+    return True
+
+def sync(seasons, datasets=None, refresh=False, warehouse_dir=None):
+    """Fill the warehouse for these seasons; a failed download is reported and skipped"""
+    for dataset in datasets or DATASETS:
+        for season in seasons:
+            try:
+                with metrics.span('warehouse_sync'):
+                    written = sync_season(dataset, season, refresh=refresh, warehouse_dir=warehouse_dir)
+                print(f"   {dataset} {season}: {'written' if written else 'already stored'}")
+            except Exception as e:
+                print(f"   Warning: Could not sync {dataset} {season}: {e}")
+
+def scan_seasons(dataset, seasons=None, columns=None, predicate=None, warehouse_dir=None):
+    """LazyFrame over several seasons of a dataset, with a `season` column.
+
+    Only the requested seasons' files are opened, and `columns`/`predicate`
+    are pushed into each Parquet scan. Seasons are concatenated diagonally,
+    so columns Savant added or dropped between years come back as nulls.
+    """
+    stored = stored_seasons(dataset, warehouse_dir)
+    seasons = stored if seasons is None else [season for season in seasons if season in stored]
+    if not seasons:
+        raise FileNotFoundError(f"No {dataset} seasons in {warehouse_dir or WAREHOUSE_DIR} - "
+                                f"run `python warehouse.py --seasons ...` first")
+    frames = [
+        prune(pl.scan_parquet(partition_path(dataset, season, warehouse_dir)), columns, predicate)
+        .with_columns(pl.lit(season, dtype=pl.Int16).alias('season'))
+        for season in seasons
+    ]
+    return pl.concat(frames, how='diagonal_relaxed')
+
+def load_seasons(dataset, seasons=None, columns=None, predicate=None, warehouse_dir=None):
+    """Collect scan_seasons into a DataFrame"""
+    with metrics.span(f"warehouse:{dataset}"):
+        return scan_seasons(dataset, seasons, columns, predicate, warehouse_dir).collect()
+
+def recent_seasons(count, through=None):
+    """The `count` seasons up to and including `through` (default: the current season)"""
+    through = SEASON_YEAR if through is None else through
+    return list(range(through - count + 1, through + 1))
+
+def print_inventory(warehouse_dir=None):
+    """Seasons, rows and size stored per dataset"""
+    print(f"\n🏛️  Warehouse {warehouse_dir or WAREHOUSE_DIR}:")
+    for dataset in DATASETS:
+        seasons = stored_seasons(dataset, warehouse_dir)
+        if not seasons:
+            print(f"   {dataset:<20} (empty)")
+            continue
+        paths = [partition_path(dataset, season, warehouse_dir) for season in seasons]
+        rows = sum(pl.scan_parquet(path).select(pl.len()).collect().item() for path in paths)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"   {dataset:<20} {', '.join(map(str, seasons))}  {rows} rows, {size / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Season-partitioned Parquet store of the leaderboards")
+    parser.add_argument('--seasons', type=int, nargs='+', default=recent_seasons(3),
+                        help="Seasons to sync (default: the last three)")
+    parser.add_argument('--dataset', action='append', choices=sorted(DATASETS),
+                        help="Only sync these datasets")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Re-download finished seasons too")
+    parser.add_argument('--list', action='store_true', help="Only show what is stored")
+    parser.add_argument('--dir', default=WAREHOUSE_DIR)
+    args = parser.parse_args()
+
+    if not args.list:
+        print(f"Syncing seasons {', '.join(map(str, args.seasons))} into {args.dir}...")
+        sync(args.seasons, datasets=args.dataset, refresh=args.refresh, warehouse_dir=args.dir)
+    print_inventory(args.dir)
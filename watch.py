@@ -0,0 +1,177 @@
+import os
+import time
+import argparse
+from datetime import datetime
+
+import frame_cache
+import http_client
+import outbox
+from delta_publish import (
+    DeltaSink, fingerprint, game_key, game_numbers, load_snapshot, save_snapshot, serialize_delta,
+)
+from slate_engine import iter_slate_scores
+from webhook_delivery import new_batch_id
+from scraper import (
+    SEASON_YEAR, USE_OUTBOX, WEBHOOK_URL, fetch_matchups, iter_game_reports,
+    load_all_sources, publish_payload,
+)
+
+# Seconds between polls of the matchup API
+WATCH_INTERVAL = float(os.getenv('WATCH_INTERVAL', '300'))
+
+# Leaderboards only change overnight; reload them (and drop every cached score) this often
+DATA_REFRESH_HOURS = float(os.getenv('WATCH_DATA_REFRESH_HOURS', '6'))
+
+def game_key_for(matchup, date):
+    """The delta_publish game_key a matchup's report will have (the matchup must carry game_number)"""
+    return game_key({'game_date': date, 'matchup': f"{matchup['away_team']} @ {matchup['home_team']}",
+                     'game_number': matchup['game_number']})
+
+def game_fingerprint(matchup):
+    """Hash of the inputs a game's report depends on: teams, probable pitchers and lineups"""
+    return fingerprint([matchup['away_team'], matchup['home_team'],
+                        matchup['away_pitcher'], matchup['home_pitcher'],
+                        matchup['away_lineup'], matchup['home_lineup']])
+
+def memoized_scorer(cache):
+    """A score_pairs function that only runs the engine for (batter, pitcher) pairs it hasn't seen"""
+    def score_pairs(pairs, all_arsenals, all_batter_stats):
+        missing = [pair for pair in dict.fromkeys(pairs) if pair not in cache]
+        if missing:
+            for pair, scored in zip(missing, iter_slate_scores(missing, all_arsenals, all_batter_stats)):
+                cache[pair] = scored
+        return (cache[pair] for pair in pairs)
+    return score_pairs
+
+class Watcher:
+    """Keeps leaderboards and scores resident and republishes only games whose inputs changed"""
+
+    def __init__(self, refresh_hours=None):
+        self.refresh_hours = DATA_REFRESH_HOURS if refresh_hours is None else refresh_hours
+        self.data = None
+        self.loaded_at = None
+        self.date = None
+        self.fingerprints = {}
+        self.pair_cache = {}
+        self.score_pairs = memoized_scorer(self.pair_cache)
+
+    def data_is_stale(self):
+        if self.data is None:
+            return True
+        if datetime.now().strftime("%Y-%m-%d") != self.date:
+            return True
+        return time.time() - self.loaded_at > self.refresh_hours * 3600
+
+    def reload(self, refresh=False):
+        """Load every source and start over with empty caches; returns this poll's matchups"""
+        print(f"Loading matchups and {SEASON_YEAR} MLB data (Savant + FanGraphs)...")
+        # Indexes and long tables of the outgoing frames would otherwise sit in the LRU next to the new ones
+        frame_cache.clear()
+        sources = load_all_sources(refresh=refresh)
+        if sources['arsenals'] is None or sources['batter_stats'] is None:
+            print("Could not load Savant leaderboards - will retry next poll")
+            return None
+        batting_baselines, pitching_baselines = sources['baselines']
+        self.data = (sources['arsenals'], sources['batter_stats'], batting_baselines, pitching_baselines)
+        self.loaded_at = time.time()
+        self.date = datetime.now().strftime("%Y-%m-%d")
+        # New leaderboards can move every score, so every game counts as changed
+        self.fingerprints = {}
+        self.pair_cache.clear()
+        print(f"Loaded {len(self.data[0])} pitchers, {len(self.data[1])} batter records")
+        return sources['matchups']
+
+    def poll(self, refresh=False):
+        """Check the API once, recompute changed games and publish their delta. Returns games recomputed"""
+        if refresh or self.data_is_stale():
+            api_data = self.reload(refresh=refresh)
+            if api_data is None:
+                return 0
+        else:
+            api_data = fetch_matchups()
+        # An empty response is far more likely an API hiccup than every game being cancelled
+        if not api_data:
+            print("No matchups returned - keeping the last published slate")
+            return 0
+
+        # Number doubleheader games over the whole slate, before only the changed ones are scored
+        api_data = [dict(m, game_number=number) for m, number in zip(api_data, game_numbers(api_data))]
+        current = {game_key_for(m, self.date): (m, game_fingerprint(m)) for m in api_data}
+        changed = [m for key, (m, game_print) in current.items() if self.fingerprints.get(key) != game_print]
+        removed = [key for key in self.fingerprints if key not in current]
+        if not changed and not removed:
+            print(f"{datetime.now():%H:%M:%S} No lineup or pitcher changes in {len(api_data)} games")
+            return 0
+
+        print(f"{datetime.now():%H:%M:%S} {len(changed)} games changed, {len(removed)} removed")
+        header = {'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"), 'date': self.date}
+        # After a reload every game is recomputed, so a full diff can also drop games no longer listed
+        sink = DeltaSink(header, load_snapshot(), partial=bool(self.fingerprints))
+        cached_pairs = len(self.pair_cache)
+        for report in iter_game_reports(changed, *self.data, score_pairs=self.score_pairs):
+            sink(report)
+        for key in removed:
+            sink.remove_game(key)
+        print(f"Scored {len(self.pair_cache) - cached_pairs} new batter/pitcher pairs "
+              f"({cached_pairs} cached)")
+
+        delta, snapshot = sink.finish()
+        print(f"Changes since last publish: {delta['changes']}")
+        settled = True
+        if not sink.has_changes():
+            print("Recomputed games match the last publish - nothing to send")
+        elif WEBHOOK_URL:
+            batch_id = new_batch_id()
+            payload = serialize_delta(delta)
+            settled = publish_payload(payload, batch_id)
+            if settled:
+                print(f"Published delta {batch_id} ({len(payload) / 1024:.0f} KB)")
+                save_snapshot(snapshot)
+        else:
+            print("No webhook URL configured - delta not published")
+
+        # Games whose delta failed to send keep their old fingerprint so the next poll retries them
+        if settled:
+            for m in changed:
+                key = game_key_for(m, self.date)
+                self.fingerprints[key] = current[key][1]
+            for key in removed:
+                del self.fingerprints[key]
+        return len(changed)
+
+def watch(interval=None, refresh=False, max_polls=None):
+    """Poll until interrupted (or max_polls), republishing changed games"""
+    interval = WATCH_INTERVAL if interval is None else interval
+    watcher = Watcher()
+    if WEBHOOK_URL and USE_OUTBOX:
+        outbox.start_worker()
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            started = time.time()
+            try:
+                watcher.poll(refresh=refresh and polls == 0)
+            except Exception as e:
+                print(f"Watch poll failed: {e}")
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(max(0.0, interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        print("\nStopping watch mode")
+    finally:
+        if WEBHOOK_URL and USE_OUTBOX:
+            remaining = outbox.stop_worker(30)
+            if remaining:
+                print(f"{remaining} payloads still queued - they are retried by `python outbox.py`")
+        http_client.print_latency_report()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Republish matchups whenever lineups or pitchers change")
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                        help="Seconds between polls of the matchup API")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Re-download leaderboards on the first poll")
+    parser.add_argument('--max-polls', type=int, help="Stop after this many polls")
+    args = parser.parse_args()
+    print(f"Watch mode running at {datetime.now()}, polling every {args.interval:g}s")
+    watch(args.interval, refresh=args.refresh, max_polls=args.max_polls)
@@ -0,0 +1,225 @@
+import os
+import gzip
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import metrics
+import outbox
+from report_writer import dumps
+
+# 'none', 'gzip' or 'zstd' - the receiver must honour Content-Encoding
+COMPRESSION_MODES = ('none', 'gzip', 'zstd')
+
+# 'none' posts one payload as before; 'game' sends one chunk per game; 'size' packs games up to WEBHOOK_CHUNK_BYTES
+CHUNKING_MODES = ('none', 'game', 'size')
+
+def check_mode(setting, value, modes):
+    """Validate a delivery setting, so a typo fails instead of quietly meaning something else"""
+    if value not in modes:
+        raise ValueError(f"Unknown webhook {setting} {value!r} - expected one of {', '.join(modes)}")
+    return value
+
+def compression_mode(value):
+    """Validate a compression mode"""
+    return check_mode('compression', value, COMPRESSION_MODES)
+
+def chunking_mode(value):
+    """Validate a chunking mode"""
+    return check_mode('chunking', value, CHUNKING_MODES)
+
+WEBHOOK_COMPRESSION = compression_mode(os.getenv('WEBHOOK_COMPRESSION', 'none'))
+WEBHOOK_CHUNKING = chunking_mode(os.getenv('WEBHOOK_CHUNKING', 'none'))
+WEBHOOK_CHUNK_BYTES = int(os.getenv('WEBHOOK_CHUNK_BYTES', str(1024 * 1024)))
+WEBHOOK_CONCURRENCY = int(os.getenv('WEBHOOK_CONCURRENCY', '4'))
+
+# Attempts per chunk on top of the HTTP client's own retries
+CHUNK_ATTEMPTS = int(os.getenv('WEBHOOK_CHUNK_ATTEMPTS', '2'))
+
+def compress(body, encoding):
+    """Compress a body, returning (bytes, content_encoding or None)"""
+    compression_mode(encoding)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    if encoding == 'zstd':
+        # zstd is optional and only imported when asked for; gzip is always available
+        try:
+            import zstandard
+        except ImportError:
+            print("   Warning: zstandard not installed, using gzip")
+            return gzip.compress(body, compresslevel=6), 'gzip'
+        return zstandard.ZstdCompressor(level=3).compress(body), 'zstd'
+    return body, None
+
+def build_chunk(header, batch_id, sequence, report_bytes, final=False, total_chunks=None):
+    """Assemble a chunk envelope around already-serialized reports, without re-serializing them"""
+    envelope = dict(header, batch_id=batch_id, sequence=sequence, final=final)
+    if total_chunks is not None:
+        envelope['total_chunks'] = total_chunks
+    head = dumps(envelope, compact=True)
+    return head[:-1] + b',"reports":[' + b','.join(report_bytes) + b']}'
+
+def chunk_headers(batch_id, sequence, final, total_chunks, content_encoding):
+    """HTTP headers describing one chunk of a batch"""
+    headers = {
+        'Content-Type': 'application/json',
+        'X-Batch-Id': batch_id,
+        'X-Chunk-Sequence': str(sequence),
+        # Lets the client retry a read timeout and the receiver drop a chunk it already has
+        'Idempotency-Key': f"{batch_id}:{sequence}",
+    }
+    if content_encoding:
+        headers['Content-Encoding'] = content_encoding
+    if final:
+        headers['X-Chunk-Total'] = str(total_chunks)
+    return headers
+
+def post_chunk(webhook_url, body, encoding, batch_id, sequence, final, total_chunks=None):
+    """POST one (possibly compressed) chunk, retrying the whole chunk if the client gives up.
+
+    Every attempt carries the chunk's Idempotency-Key, so a resend after a
+    timeout can't duplicate reports at the receiver.
+    """
+    payload, content_encoding = compress(body, encoding)
+    headers = chunk_headers(batch_id, sequence, final, total_chunks, content_encoding)
+
+    last_error = None
+    for attempt in range(CHUNK_ATTEMPTS):
+        try:
+            with metrics.span('webhook_chunk'):
+                response = http_client.post(webhook_url, endpoint='webhook', data=payload,
+                                            headers=headers, timeout=(5, 30))
+                response.raise_for_status()
+            metrics.incr('webhook_bytes_sent', len(payload))
+            return len(payload)
+        except Exception as e:
+            last_error = e
+            print(f"   Chunk {sequence} attempt {attempt + 1}/{CHUNK_ATTEMPTS} failed: {e}")
+    raise last_error
+
+def new_batch_id():
+    """Unique id for one run's delivery batch"""
+    return uuid.uuid4().hex
+
+def outbox_deliverer(webhook_url, batch_id, compression=None, conn=None):
+    """A ChunkedWebhookSink deliver function that queues chunks in the durable outbox.
+
+    Without `conn`, each chunk opens and closes its own connection.
+    """
+    compression = compression or WEBHOOK_COMPRESSION
+
+    def deliver(body, sequence, final, total_chunks):
+        payload, content_encoding = compress(body, compression)
+        headers = chunk_headers(batch_id, sequence, final, total_chunks, content_encoding)
+        with outbox.connection(conn) as queue:
+            queued = outbox.enqueue(queue, webhook_url, payload, headers, f"{batch_id}:{sequence}")
+        if queued:
+            metrics.incr('webhook_bytes_queued', len(payload))
+
+    return deliver
+
+def enqueue_payload(webhook_url, body, batch_id, compression=None, conn=None):
+    """Queue a whole (unchunked) payload in the durable outbox"""
+    payload, content_encoding = compress(body, compression or WEBHOOK_COMPRESSION)
+    headers = {'Content-Type': 'application/json', 'X-Batch-Id': batch_id}
+    if content_encoding:
+        headers['Content-Encoding'] = content_encoding
+    with outbox.connection(conn) as queue:
+        queued = outbox.enqueue(queue, webhook_url, payload, headers, batch_id)
+    if queued:
+        metrics.incr('webhook_bytes_queued', len(payload))
+    return queued
+
+class ChunkedWebhookSink:
+    """Report-writer sink that ships game reports to the webhook in chunks as they are written.
+
+    Every chunk carries batch_id and sequence. The last chunk is held back
+    until finish() so it can be marked final with total_chunks, letting the
+    receiver know when it has the whole batch. Chunks upload concurrently.
+    """
+
+    def __init__(self, webhook_url, header, chunking=None, chunk_bytes=None, compression=None,
+                 concurrency=None, deliver=None, batch_id=None):
+        self.webhook_url = webhook_url
+        self.header = header
+        self.chunking = chunking_mode(chunking or WEBHOOK_CHUNKING)
+        self.chunk_bytes = chunk_bytes or WEBHOOK_CHUNK_BYTES
+        self.compression = compression_mode(compression or WEBHOOK_COMPRESSION)
+        self.batch_id = batch_id or new_batch_id()
+        # Envelope bytes around the reports, sized for the widest sequence and final fields
+        self._overhead = len(build_chunk(header, self.batch_id, 10 ** 9, [], final=True, total_chunks=10 ** 9))
+        # deliver(body, sequence, final, total_chunks) - defaults to a concurrent upload
+        self.deliver = deliver or self._submit_upload
+        self._executor = None if deliver else ThreadPoolExecutor(
+            max_workers=concurrency or WEBHOOK_CONCURRENCY)
+        self._futures = []
+        self._pending = []
+        self._pending_size = 0
+        self._held = None
+        self._sequence = 0
+        self.raw_bytes = 0
+
+    def __call__(self, report, report_bytes):
+        # Close the chunk before a report would push it past chunk_bytes (commas between reports included);
+        # a report bigger than the bound on its own goes out as a chunk by itself
+        if self.chunking == 'size' and self._pending and (
+                self._overhead + self._pending_size + len(self._pending) + len(report_bytes) > self.chunk_bytes):
+            self._flush()
+        self._pending.append(report_bytes)
+        self._pending_size += len(report_bytes)
+        if self.chunking == 'game':
+            self._flush()
+
+    def _flush(self):
+        """Close the pending reports into a chunk, and release the previously held chunk"""
+        if not self._pending:
+            return
+        chunk = (self._sequence, self._pending)
+        self._sequence += 1
+        self._pending = []
+        self._pending_size = 0
+        if self._held is not None:
+            sequence, reports = self._held
+            self._send(sequence, reports)
+        self._held = chunk
+
+    def _send(self, sequence, reports, final=False, total_chunks=None):
+        body = build_chunk(self.header, self.batch_id, sequence, reports, final, total_chunks)
+        self.raw_bytes += len(body)
+        self.deliver(body, sequence, final, total_chunks)
+
+    def _submit_upload(self, body, sequence, final, total_chunks):
+        self._futures.append((sequence, self._executor.submit(
+            post_chunk, self.webhook_url, body, self.compression, self.batch_id,
+            sequence, final, total_chunks)))
+
+    def finish(self):
+        """Send the final chunk and wait for uploads; returns a delivery summary"""
+        self._flush()
+        total_chunks = self._sequence or 1
+        if self._held is not None:
+            sequence, reports = self._held
+            self._held = None
+        else:
+            # Empty slate: still tell the receiver the batch exists and is complete
+            sequence, reports = 0, []
+        self._send(sequence, reports, final=True, total_chunks=total_chunks)
+
+        # With a custom deliver (e.g. the outbox) nothing is sent from here
+        sent_bytes = 0 if self._executor is not None else None
+        failed = []
+        for sequence, future in self._futures:
+            try:
+                sent_bytes += future.result()
+            except Exception:
+                failed.append(sequence)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+        return {
+            'batch_id': self.batch_id,
+            'chunks': total_chunks,
+            'failed_chunks': failed,
+            'raw_bytes': self.raw_bytes,
+            'sent_bytes': sent_bytes,
+        }